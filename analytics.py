@@ -0,0 +1,219 @@
+import json
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from catalogue import tier_of
+
+# Expertise tiers: Limited (1-2 points), Secondary (3-7 points), Primary (8-10 points)
+TIER_BINS = [1, 3, 8]
+
+def skill_matrix(df, skill_cols):
+    """Return the numeric score matrix for skill_cols, with missing and non-numeric cells as 0"""
+    dtypes = df.dtypes
+    positions = [i for i, col in enumerate(skill_cols) if pd.api.types.is_numeric_dtype(dtypes[col])]
+    if len(positions) == len(skill_cols):
+        return df[skill_cols].to_numpy(dtype=float, na_value=0.0)
+    values = np.zeros((len(df), len(skill_cols)), dtype=float)
+    if positions:
+        numeric_cols = [skill_cols[i] for i in positions]
+        values[:, positions] = df[numeric_cols].to_numpy(dtype=float, na_value=0.0)
+    return values
+
+def filter_responses(responses_df, query="", start_date=None, end_date=None):
+    """Return the positions of responses matching a name/email search and a submission date range"""
+    mask = np.ones(len(responses_df), dtype=bool)
+    if query:
+        query = query.strip().lower()
+        names = responses_df['Submitter Name'].astype(str).str.lower()
+        emails = responses_df['Submitter Email'].astype(str).str.lower()
+        mask &= (names.str.contains(query, regex=False) | emails.str.contains(query, regex=False)).to_numpy()
+    if start_date or end_date:
+        # Timestamps are stored as "%Y-%m-%d %H:%M:%S", so the date prefix compares as a string
+        dates = responses_df['Timestamp'].astype(str).str[:10]
+        if start_date:
+            mask &= (dates >= start_date.isoformat()).to_numpy()
+        if end_date:
+            mask &= (dates <= end_date.isoformat()).to_numpy()
+    return np.flatnonzero(mask)
+
+def leave_one_out_averages(total_sums, total_counts, own_sums, own_counts):
+    """Team averages per skill excluding one respondent's own contribution (0 where nobody else answered)"""
+    sums = total_sums - own_sums
+    counts = total_counts - own_counts
+    return np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+
+def tier_matrix(values):
+    """Bin a score matrix into tier codes: 0 none, 1 Limited, 2 Secondary, 3 Primary"""
+    # Summing threshold comparisons bins every cell at once; NaN compares False and stays 0
+    tiers = np.zeros(values.shape, dtype=np.int8)
+    for threshold in TIER_BINS:
+        tiers += values >= threshold
+    return tiers
+
+# Results memoized per data version, shared by every session in the process
+_summary_cache = {}
+_summary_lock = threading.Lock()
+
+def cached_summary(name, version, compute):
+    """Return compute() for the given data version, recomputing only when the version changes"""
+    with _summary_lock:
+        entry = _summary_cache.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+    result = compute()
+    with _summary_lock:
+        _summary_cache[name] = (version, result)
+    return result
+
+# Running analytics snapshot
+#
+# Keeps everything the dashboard summarizes as running aggregates so a submission
+# updates it in O(skills) and the dashboard never has to scan all responses:
+# per-skill sum/count and tier counts, a per-day histogram and hashed participant emails.
+
+def _email_key(email):
+    return hashlib.sha1(str(email).encode('utf-8')).hexdigest()[:16]
+
+class AnalyticsSnapshot:
+    """Running aggregates over all responses, tagged with the data version they describe"""
+
+    def __init__(self, version=None):
+        self.version = version
+        self.responses = 0
+        self.skills = {}        # skill -> [sum, count, limited, secondary, primary]
+        self.daily = {}         # 'YYYY-MM-DD' -> submissions
+        self.participants = set()
+
+    @classmethod
+    def from_frame(cls, df, skill_cols, version=None):
+        """Build a snapshot from scratch with one vectorized pass over the responses"""
+        snapshot = cls(version)
+        snapshot.responses = len(df)
+        values = skill_matrix(df, skill_cols)
+        present = df[skill_cols].notna().to_numpy() if skill_cols else np.zeros((len(df), 0), bool)
+        tiers = tier_matrix(values)
+        sums = values.sum(axis=0)
+        counts = present.sum(axis=0)
+        for i, skill in enumerate(skill_cols):
+            snapshot.skills[skill] = [
+                float(sums[i]), int(counts[i]),
+                int((tiers[:, i] == 1).sum()), int((tiers[:, i] == 2).sum()), int((tiers[:, i] == 3).sum()),
+            ]
+        snapshot._add_metadata(df)
+        return snapshot
+
+    @classmethod
+    def from_sparse(cls, meta, allocations, skill_cols, version=None):
+        """Build a snapshot from sparse allocations, in time proportional to the points allocated"""
+        snapshot = cls(version)
+        snapshot.responses = len(meta)
+        points = allocations['Points'].to_numpy(dtype=float)
+        allocated = pd.DataFrame({'Skill': allocations['Skill'].to_numpy(), 'Points': points,
+                                  'Tier': tier_matrix(points)})
+        sums = allocated.groupby('Skill')['Points'].sum()
+        tiers = allocated.groupby(['Skill', 'Tier']).size()
+        for skill in skill_cols:
+            # Skills a response did not allocate count as 0 points, so every response counts
+            snapshot.skills[skill] = [
+                float(sums.get(skill, 0.0)), len(meta),
+                int(tiers.get((skill, 1), 0)), int(tiers.get((skill, 2), 0)), int(tiers.get((skill, 3), 0)),
+            ]
+        snapshot._add_metadata(meta)
+        return snapshot
+
+    def _add_metadata(self, df):
+        """Fill the per-day histogram and participant set from the metadata columns"""
+        if 'Timestamp' in df.columns:
+            dates = pd.to_datetime(df['Timestamp'], errors='coerce').dropna().dt.strftime('%Y-%m-%d')
+            self.daily = {day: int(n) for day, n in dates.value_counts().sort_index().items()}
+        if 'Submitter Email' in df.columns:
+            self.participants = {_email_key(email) for email in df['Submitter Email'].dropna()}
+
+    def add(self, response_data, metadata_cols):
+        """Fold one new response into the aggregates"""
+        self.responses += 1
+        for skill, value in response_data.items():
+            if skill in metadata_cols:
+                continue
+            stats = self.skills.setdefault(skill, [0.0, 0, 0, 0, 0])
+            if isinstance(value, (int, float)) and not pd.isna(value):
+                stats[0] += value
+                stats[1] += 1
+                tier = tier_of(value)
+                if tier:
+                    stats[1 + tier] += 1
+        timestamp = str(response_data.get('Timestamp', ''))[:10]
+        if timestamp:
+            self.daily[timestamp] = self.daily.get(timestamp, 0) + 1
+        if response_data.get('Submitter Email') is not None:
+            self.participants.add(_email_key(response_data['Submitter Email']))
+
+    def to_json(self):
+        return json.dumps({
+            'version': self.version,
+            'responses': self.responses,
+            'skills': self.skills,
+            'daily': self.daily,
+            'participants': sorted(self.participants),
+        })
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        snapshot = cls(data.get('version'))
+        snapshot.responses = data['responses']
+        snapshot.skills = data['skills']
+        snapshot.daily = data['daily']
+        snapshot.participants = set(data['participants'])
+        return snapshot
+
+    @classmethod
+    def load(cls, path):
+        """Read a persisted snapshot, or None if it is missing or unreadable"""
+        try:
+            with open(path) as f:
+                return cls.from_json(f.read())
+        except (OSError, ValueError, KeyError):
+            return None
+
+    # Views used by the admin dashboard
+
+    def unique_participants(self):
+        return len(self.participants)
+
+    def tier_counts(self):
+        """Skills x tier matrix counting how many responses put each skill in each tier"""
+        skills = list(self.skills)
+        return pd.DataFrame({
+            'Primary': [self.skills[s][4] for s in skills],
+            'Secondary': [self.skills[s][3] for s in skills],
+            'Limited': [self.skills[s][2] for s in skills],
+        }, index=skills, dtype=int)
+
+    def average_skills_per_person(self):
+        """Average number of Primary/Secondary/Limited skills per response"""
+        totals = self.tier_counts().sum()
+        return totals / self.responses if self.responses else totals * 0.0
+
+    def average_points(self):
+        """Mean points per skill over the responses that have a value for it"""
+        return pd.Series({skill: (stats[0] / stats[1] if stats[1] else np.nan)
+                          for skill, stats in self.skills.items()}, dtype=float)
+
+    def leave_one_out_averages(self, own_df, skill_cols):
+        """Team averages per skill excluding one respondent's responses, in O(skills) per own response"""
+        totals = [self.skills.get(skill, (0.0, 0)) for skill in skill_cols]
+        total_sums = np.array([stats[0] for stats in totals], dtype=float)
+        total_counts = np.array([stats[1] for stats in totals], dtype=float)
+        own_sums = skill_matrix(own_df, skill_cols).sum(axis=0)
+        own_counts = own_df[skill_cols].notna().to_numpy().sum(axis=0)
+        return pd.Series(leave_one_out_averages(total_sums, total_counts, own_sums, own_counts),
+                         index=skill_cols)
+
+    def daily_submissions(self):
+        days = sorted(self.daily)
+        return pd.DataFrame({
+            'Date': pd.to_datetime(days).date if days else [],
+            'Submissions': [self.daily[day] for day in days],
+        })
@@ -0,0 +1,99 @@
+"""Contention benchmark: submit responses from N processes at once and check no rows are lost
+
+Usage:
+    python benchmarks/bench_contention.py --processes 8 --submissions 50 --backend log
+"""
+import os
+import sys
+import time
+import uuid
+import argparse
+import tempfile
+import multiprocessing
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import FileLock, get_repository
+
+SKILL_COLUMNS = [f"Benchmark Skill {i} (Skill {i})" for i in range(1, 169)]
+
+def make_response(worker, index):
+    """Build a response shaped like a real form submission"""
+    response = {
+        'Response ID': str(uuid.uuid4())[:8],
+        'Timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'Submitter Email': f"worker{worker}@example.com",
+        'Submitter Name': f"Worker {worker}",
+    }
+    for i, skill in enumerate(SKILL_COLUMNS):
+        response[skill] = 10 if (i + index) % 14 == 0 else 0
+    return response
+
+def open_repository(backend, directory):
+    return get_repository(backend, os.path.join(directory, "responses.csv"),
+                          log_path=os.path.join(directory, "responses.log"),
+                          db_path=os.path.join(directory, "responses.db"))
+
+def worker(backend, directory, worker_id, submissions, use_lock, start_event):
+    repository = open_repository(backend, directory)
+    lock = FileLock(os.path.join(directory, "responses.lock"))
+    start_event.wait()
+    for index in range(submissions):
+        response = make_response(worker_id, index)
+        try:
+            if use_lock:
+                with lock:
+                    repository.add(response)
+            else:
+                repository.add(response)
+        except Exception:
+            # Failed writes show up as lost rows in the final count
+            continue
+
+def run(backend, processes, submissions, use_lock):
+    with tempfile.TemporaryDirectory() as directory:
+        # Create the store up front so workers do not race on initialization
+        open_repository(backend, directory)
+        start_event = multiprocessing.Event()
+        workers = [
+            multiprocessing.Process(target=worker,
+                                    args=(backend, directory, i, submissions, use_lock, start_event))
+            for i in range(processes)
+        ]
+        for p in workers:
+            p.start()
+        started = time.perf_counter()
+        start_event.set()
+        for p in workers:
+            p.join()
+        elapsed = time.perf_counter() - started
+
+        expected = processes * submissions
+        try:
+            stored = len(open_repository(backend, directory).load())
+        except Exception as e:
+            print(f"  could not read store back: {e}")
+            stored = 0
+        lost = expected - stored
+        print(f"{backend:>6} lock={'on' if use_lock else 'off':<3} processes={processes:<3} "
+              f"submitted={expected:<6} stored={stored:<6} lost={lost:<5} "
+              f"elapsed={elapsed:.2f}s throughput={expected / elapsed:.0f}/s")
+        return lost
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--submissions", type=int, default=50, help="submissions per process")
+    parser.add_argument("--backend", choices=["csv", "log", "sqlite", "all"], default="all")
+    parser.add_argument("--no-lock", action="store_true", help="skip the FileLock to show what it prevents")
+    args = parser.parse_args()
+
+    backends = ["csv", "log", "sqlite"] if args.backend == "all" else [args.backend]
+    total_lost = 0
+    for backend in backends:
+        total_lost += run(backend, args.processes, args.submissions, not args.no_lock)
+    sys.exit(1 if total_lost and not args.no_lock else 0)
+
+if __name__ == "__main__":
+    main()
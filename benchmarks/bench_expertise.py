@@ -0,0 +1,65 @@
+"""Benchmark the Skills Analysis expertise averages: row-wise apply vs the analytics snapshot
+
+The dashboard reads the averages from AnalyticsSnapshot, which is rebuilt from the full
+data only when it is stale and otherwise updated per submission. Both costs are timed:
+the rebuild (from_frame) and the per-render read of an up-to-date snapshot.
+
+Usage:
+    python benchmarks/bench_expertise.py --sizes 10000 100000
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import AnalyticsSnapshot
+
+SKILL_COLUMNS = [f"Benchmark Skill {i} (Skill {i})" for i in range(1, 169)]
+
+def make_responses(n, seed=0):
+    """Synthetic responses: each respondent spreads 120 points over a dozen or so skills"""
+    rng = np.random.default_rng(seed)
+    scores = np.zeros((n, len(SKILL_COLUMNS)))
+    for row in range(n):
+        chosen = rng.choice(len(SKILL_COLUMNS), size=rng.integers(12, 30), replace=False)
+        scores[row, chosen] = rng.integers(1, 11, size=len(chosen))
+    df = pd.DataFrame(scores, columns=SKILL_COLUMNS)
+    df.insert(0, 'Submitter Email', [f"respondent{i}@example.com" for i in range(n)])
+    df.insert(0, 'Timestamp', "2024-01-01 09:00:00")
+    df.insert(0, 'Response ID', [f"{i:08x}" for i in range(n)])
+    return df
+
+def rowwise_apply(df, skill_cols):
+    """The original per-row implementation from show_admin_page"""
+    def get_expertise_counts(row):
+        primary = sum(1 for x in row if isinstance(x, (int, float)) and x >= 8)
+        secondary = sum(1 for x in row if isinstance(x, (int, float)) and 3 <= x < 8)
+        limited = sum(1 for x in row if isinstance(x, (int, float)) and 1 <= x < 3)
+        return pd.Series({'Primary': primary, 'Secondary': secondary, 'Limited': limited})
+    return df[skill_cols].apply(get_expertise_counts, axis=1)
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        df = make_responses(n)
+        snapshot, rebuild_time = timed(AnalyticsSnapshot.from_frame, df, SKILL_COLUMNS)
+        averages, render_time = timed(snapshot.average_skills_per_person)
+        baseline, baseline_time = timed(rowwise_apply, df, SKILL_COLUMNS)
+        same = np.allclose(baseline.astype(float).mean().to_numpy(), averages.to_numpy())
+        print(f"n={n:<7} apply={baseline_time:8.3f}s snapshot_rebuild={rebuild_time:8.4f}s "
+              f"snapshot_render={render_time * 1000:7.2f}ms identical={same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Load test: N concurrent respondents fill the 168-skill form and submit, per backend and data size
+
+Each respondent runs in its own process against a scratch copy of the app's files, so the
+measured path is the app's own: either main.save_response called directly (--mode direct) or
+the Streamlit script driven headlessly through AppTest (--mode apptest), from filling the
+per-skill inputs to the Submit click.
+
+Usage:
+    python benchmarks/bench_load.py --concurrency 8 --respondents 200 --sizes 0 10000 --backend all
+    python benchmarks/bench_load.py --mode apptest --concurrency 4 --respondents 20 --backend log
+"""
+import os
+import sys
+import time
+import uuid
+import argparse
+import tempfile
+import multiprocessing
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from catalogue import METADATA_COLUMNS, SKILL_COLUMNS
+
+BACKENDS = ["csv", "log", "sqlite", "columnar"]
+SKILLS_PER_RESPONDENT = 12
+
+def allocation(rng):
+    """120 points over a dozen skills, the way most respondents fill the form"""
+    chosen = rng.choice(len(SKILL_COLUMNS), size=SKILLS_PER_RESPONDENT, replace=False)
+    return sorted(int(i) for i in chosen)
+
+def seed_responses(path, size, seed=0):
+    """Write size existing responses to the legacy CSV every backend starts from"""
+    rng = np.random.default_rng(seed)
+    scores = np.zeros((size, len(SKILL_COLUMNS)), dtype=np.int64)
+    for row in range(size):
+        scores[row, allocation(rng)] = 10
+    df = pd.DataFrame(scores, columns=SKILL_COLUMNS)
+    df.insert(0, 'Submitter Name', [f"Seed {i}" for i in range(size)])
+    df.insert(0, 'Submitter Email', [f"seed{i}@example.com" for i in range(size)])
+    df.insert(0, 'Timestamp', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    df.insert(0, 'Response ID', [f"{i:08x}" for i in range(size)])
+    df[METADATA_COLUMNS + SKILL_COLUMNS].to_csv(path, index=False)
+
+def open_app(directory, backend):
+    """Import the app inside a scratch directory so its relative data files land there"""
+    os.chdir(directory)
+    os.environ["SKILLS_STORAGE_BACKEND"] = backend
+    os.environ["SKILLS_FORM_WIDGET"] = "inputs"
+    import main
+    return main
+
+def prepare(directory, backend, size, results):
+    """Seed the store and run the schema check once, before any respondent starts"""
+    if size:
+        seed_responses(os.path.join(directory, "skills_responses.csv"), size)
+    main = open_app(directory, backend)
+    main.ensure_schema()
+    results.put(len(main.load_responses()))
+
+def count_stored(directory, backend, results):
+    main = open_app(directory, backend)
+    results.put(len(main.load_responses()))
+
+def submit_direct(main, respondent, rng):
+    """Fill all 168 fields in a response and time the save"""
+    response = {
+        'Response ID': str(uuid.uuid4())[:8],
+        'Submitter Name': f"Respondent {respondent}",
+        'Timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'Submitter Email': f"respondent{respondent}@example.com",
+    }
+    chosen = set(allocation(rng))
+    for i, skill in enumerate(SKILL_COLUMNS):
+        response[skill] = 10 if i in chosen else 0
+    started = time.perf_counter()
+    saved = main.save_response(response)
+    return time.perf_counter() - started, saved
+
+def submit_apptest(main, respondent, rng):
+    """Drive the form through AppTest and time the Submit click"""
+    from streamlit.testing.v1 import AppTest
+    from catalogue import SKILL_IDS
+    app = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=120)
+    app.run()
+    app.text_input[0].input(f"Respondent {respondent}").run()
+    app.text_input[1].input(f"respondent{respondent}@example.com").run()
+    for i in allocation(rng):
+        skill = SKILL_COLUMNS[i]
+        # Search brings the skill's input into view without expanding a section
+        app.text_input(key='skill_search').input(skill.split(" (Skill")[0]).run()
+        app.number_input(key=f"input_{SKILL_IDS[skill]}").set_value(10).run()
+    app.text_input(key='skill_search').input("").run()
+    submit = [button for button in app.button if button.label == "Submit Skills Matrix"][0]
+    started = time.perf_counter()
+    submit.click().run()
+    elapsed = time.perf_counter() - started
+    return elapsed, bool(app.session_state['form_submitted']) and not app.exception
+
+def respondent_worker(directory, backend, mode, respondents, ready, start_event, results):
+    main = open_app(directory, backend)
+    submit = submit_apptest if mode == "apptest" else submit_direct
+    rng = np.random.default_rng(respondents[0] if respondents else 0)
+    ready.put(os.getpid())
+    start_event.wait()
+    for respondent in respondents:
+        try:
+            elapsed, saved = submit(main, respondent, rng)
+        except Exception:
+            # Failed submissions show up as lost rows in the final count
+            elapsed, saved = None, False
+        results.put((elapsed, saved))
+
+def run_child(context, target, *args):
+    results = context.Queue()
+    process = context.Process(target=target, args=args + (results,))
+    process.start()
+    value = results.get()
+    process.join()
+    return value
+
+def run(backend, size, concurrency, respondents, mode):
+    # Spawned processes start from a fresh interpreter, like separate app replicas
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        seeded = run_child(context, prepare, directory, backend, size)
+
+        ready = context.Queue()
+        start_event = context.Event()
+        results = context.Queue()
+        assignments = [list(range(worker, respondents, concurrency)) for worker in range(concurrency)]
+        workers = [
+            context.Process(target=respondent_worker,
+                            args=(directory, backend, mode, assigned, ready, start_event, results))
+            for assigned in assignments if assigned
+        ]
+        for p in workers:
+            p.start()
+        # Start the clock once every worker has imported the app
+        for _ in workers:
+            ready.get()
+        started = time.perf_counter()
+        start_event.set()
+        outcomes = [results.get() for _ in range(respondents)]
+        elapsed = time.perf_counter() - started
+        for p in workers:
+            p.join()
+
+        stored = run_child(context, count_stored, directory, backend)
+
+    latencies = np.array([e for e, _ in outcomes if e is not None]) * 1000
+    failed = sum(1 for _, saved in outcomes if not saved)
+    lost = respondents - (stored - seeded)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+    print(f"{backend:>8} size={size:<7} respondents={respondents:<5} concurrency={concurrency:<3} "
+          f"p50={p50:7.1f}ms p95={p95:7.1f}ms p99={p99:7.1f}ms "
+          f"throughput={respondents / elapsed:6.1f}/s failed={failed:<4} lost={lost}")
+    return lost
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["direct", "apptest"], default="direct")
+    parser.add_argument("--concurrency", type=int, default=8, help="respondents submitting at once")
+    parser.add_argument("--respondents", type=int, default=200, help="total submissions per run")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 10000],
+                        help="existing responses in the store before the run")
+    parser.add_argument("--backend", choices=BACKENDS + ["all"], default="all")
+    args = parser.parse_args()
+
+    backends = BACKENDS if args.backend == "all" else [args.backend]
+    total_lost = 0
+    for size in args.sizes:
+        for backend in backends:
+            total_lost += run(backend, size, args.concurrency, args.respondents, args.mode)
+    sys.exit(1 if total_lost else 0)
+
+if __name__ == "__main__":
+    main()
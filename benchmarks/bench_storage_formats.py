@@ -0,0 +1,53 @@
+"""Compare load time and memory of the CSV and columnar response stores
+
+Usage:
+    python benchmarks/bench_storage_formats.py --sizes 10000 50000
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from storage import ColumnarRepository
+from bench_expertise import make_responses
+
+def frame_megabytes(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        df = make_responses(n)
+        df['Timestamp'] = "2025-01-21 18:54:02"
+        df['Submitter Email'] = [f"user{i}@example.com" for i in range(n)]
+        df['Submitter Name'] = [f"User {i}" for i in range(n)]
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "responses.csv")
+            df.to_csv(csv_path, index=False)
+            repository = ColumnarRepository(os.path.join(directory, "responses"), legacy_csv_path=csv_path)
+
+            started = time.perf_counter()
+            csv_df = pd.read_csv(csv_path)
+            csv_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            columnar_df = repository.load()
+            columnar_time = time.perf_counter() - started
+
+            csv_disk = os.path.getsize(csv_path) / 1e6
+            columnar_disk = sum(os.path.getsize(p) / 1e6 for p in
+                                (repository.scores_path, repository.meta_path, repository.columns_path))
+            print(f"n={n:<7} load csv={csv_time:6.3f}s columnar={columnar_time:6.3f}s | "
+                  f"ram csv={frame_megabytes(csv_df):7.1f}MB columnar={frame_megabytes(columnar_df):6.1f}MB | "
+                  f"disk csv={csv_disk:6.1f}MB columnar={columnar_disk:5.1f}MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+import re
+from functools import lru_cache
+import pandas as pd
+
+METADATA_COLUMNS = ['Response ID', 'Timestamp', 'Submitter Email', 'Submitter Name']
+
+# Skill catalogue
+#
+# Every skill column is named "<display name> (Skill <id>)". The id is the stable integer
+# key used by storage and by the form widgets; lookups below are built once per process.
+
+SKILL_COLUMNS = [
+    'Acquisitions (Skill 1)',
+    'Advertising and Labeling Regulations (Pharma/BioTech) (Skill 2)',
+    'Advertising and Marketing Regulations (Retail and Consumer) (Skill 3)',
+    'Advertising Technology (AdTech) (Skill 4)',
+    'Affiliate Marketing Agreements (Skill 5)',
+    'Amalgamations (Skill 6)',
+    'Artificial Intelligence Terms, Regulations & Compliance (Skill 7)',
+    'Associations (Skill 8)',
+    'Banking and Finance Transactions (Skill 9)',
+    'Banking Regulation and Compliance (Skill 10)',
+    'Bankrupcty and Insolvency (Debtor/Creditor) (Skill 11)',
+    'Biotech Agreements (Skill 12)',
+    'Blockchain Governance (Skill 13)',
+    'Board of Directors and Committees (Skill 14)',
+    'Canadian Anti-Spam Legislation (CASL) (Skill 15)',
+    "Children's Privacy (Skill 16)",
+    'Clinical Trials and Research (Skill 17)',
+    'Collections (Skill 18)',
+    'Commercial Contracts (Skill 19)',
+    'Commercial Real Estate Transactions (Skill 20)',
+    'Competition (Skill 21)',
+    'Construction (Skill 22)',
+    'Consumer Banking Regulations (Skill 23)',
+    'Consumer Protection (B2C) (Skill 24)',
+    'Content Creation and Copyright (Skill 25)',
+    'Content Removal and Takedown (Skill 26)',
+    'Continuous Disclosure (Skill 27)',
+    'Copyright and Fair Dealing (Skill 28)',
+    'Corporate Bylaws, Records and Governance (Skill 29)',
+    'Corporate Reorganization (Skill 30)',
+    'Corruption and Anti-Bribery (Skill 31)',
+    'Cross-Border Privacy Compliance (Skill 32)',
+    'Cross-Border Transactions (Skill 33)',
+    'Cryptocurrency Exchange (Digital Assets & Blockchain) (Skill 34)',
+    'Customs Regulations (Skill 35)',
+    'Cybersecurity and Data Protection (Regulatory Compliance) (Skill 36)',
+    'Cybersecurity/Data Breach Incident Response (Skill 37)',
+    'Data Collection, Sales and Compliance (Data Brokers) (Skill 38)',
+    'Debt & Equity Financing (Skill 39)',
+    'Deferred Compensation Plans (Skill 40)',
+    'Demand Response Agreements (Skill 41)',
+    'Derivatives and Commodities (Skill 42)',
+    'Digital Advertising Regulation (Skill 43)',
+    'Digital Media and Online Content (Skill 44)',
+    'Digital Payment Regulations (Skill 45)',
+    'Dissolutions (Skill 46)',
+    'Distribution and Supply Agreements (Skill 47)',
+    'Drones (Skill 48)',
+    'Drug, Alcohol, Gaming Regulatory (Skill 49)',
+    'Due Diligence and Valuation (Skill 50)',
+    'eCommerce (Skill 51)',
+    'Employee Benefits Plans (Skill 52)',
+    'Employee side Employment Issues (Skill 53)',
+    'Employee Stock Purchase Plans (Skill 54)',
+    'Employee Training Programs (Skill 55)',
+    'Employer Side Employment Issues (Skill 56)',
+    'Employment Agreements (Skill 57)',
+    'Employment; Notice, Severance and Termination (Skill 58)',
+    'Employment; Workplace Discrimination and Human Rights (Skill 59)',
+    'Employment-based Immigration (Skill 60)',
+    'Energy Contracts and Agreements (Skill 61)',
+    'Energy - Hydro (Skill 62)',
+    'Energy - Nuclear (Skill 63)',
+    'Energy - Solar (Skill 64)',
+    'Energy - Wind (Skill 65)',
+    'Entertainment and Sponsorship Agreements (Skill 66)',
+    'Environmental Sustainability Compliance (Skill 67)',
+    'Equity Compensation or Incentive Plans (Skill 68)',
+    'Escrow Agreements (Skill 69)',
+    'Executive Compensation (Skill 70)',
+    'Export Control Regulations (Skill 71)',
+    'Federal and Provincial Government Contracting (Prime and Subs) (Skill 72)',
+    'Financial Services Regulatory Requirements (Skill 73)',
+    'Financial Transactions and Structuring (Skill 74)',
+    'Fintech (Skill 75)',
+    'Fintrac (Skill 76)',
+    'Forced Labour and Slavery (Skill 77)',
+    'Formation and Entity Creation/Operating Agreements (Skill 78)',
+    'Founder Agreements (Skill 79)',
+    'Franchise Law - Franchisee (Skill 80)',
+    'Franchise Law - Franchisor (Skill 81)',
+    'Global/Cross-Border Employment Issues (Skill 82)',
+    'Health Canada Compliance, Regulations and Enforcement (Skill 83)',
+    'Healthcare Compliance and Regulations (Skill 84)',
+    'Higher Education Regulations (Skill 85)',
+    'Immigration - Business (Skill 86)',
+    'Immigration - Personal/Family (Skill 87)',
+    'Incorporations (Federal) (Skill 88)',
+    'Incorporations (Professional) (Skill 89)',
+    'Incorporations (Provincial) (Skill 90)',
+    'Independent Contractor Agreements (Skill 91)',
+    'Independent Schools (Skill 92)',
+    'Indigenous Rights and Relations (Skill 93)',
+    'Influencer Agreements (Skill 94)',
+    'Initial Public Offering (IPO) (Skill 95)',
+    'Insurance Coverage Review (Skill 96)',
+    'Intellectual Property in M&A (Skill 97)',
+    'Intellectual Property Infringement (Skill 98)',
+    'Intellectual Property Licensing (Skill 99)',
+    'Intellectual Property Protection (Skill 100)',
+    'International Data Transfers (Skill 101)',
+    'International Trade and Import Export (Skill 102)',
+    'International/Foreign Government Contracts (Skill 103)',
+    'Investment and Funding (Skill 104)',
+    'Investment Law and Regulations (Skill 105)',
+    'Investor Relations and Reporting (Skill 106)',
+    'Joint Ventures and Strategic Alliances (Skill 107)',
+    'Labour and Union (Skill 108)',
+    'Land Use and Zoning (Skill 109)',
+    'Leasing (Commercial Property) (Skill 110)',
+    'Leasing (Equipment) (Skill 111)',
+    'Lending (secured or unsecured) (Skill 112)',
+    'Life Sciences Licensing and Tech Transfer Agreements (Skill 113)',
+    'Litigation (Civil) (Skill 114)',
+    'Litigation (Employment) (Skill 115)',
+    'Litigation (Small Claims) (Skill 116)',
+    'Litigation Management (Skill 117)',
+    'Lobbying and PACs (Skill 118)',
+    'Loyalty Card Programs (Skill 119)',
+    'M&A (Skill 120)',
+    'Master Services Agreements (Skill 121)',
+    'Media Production Contracts (Skill 122)',
+    'Mediation (Skill 123)',
+    'Medical Device Licensing and Distribution (Skill 124)',
+    'Medical Device Regulations (Skill 125)',
+    'Mining (Skill 126)',
+    'Money Laundering and AML Regulations (Skill 127)',
+    'Municipality (Skill 128)',
+    'Natural Resource Management (Skill 129)',
+    'Non-Competition and Solicitation Agreements (Skill 130)',
+    'Non-Disclosure Agreements (Skill 131)',
+    'Non-Profit Law (Skill 132)',
+    'Occupational Health and Safety (Skill 133)',
+    'Oil and Gas Regulation (Skill 134)',
+    'Open Source Agreements (Skill 135)',
+    'Patent Portfolio Management (Skill 136)',
+    'Patent Prosecution (Skill 137)',
+    'Payment Systems and Digital Payments (Skill 138)',
+    'Pension Fund Management (Skill 139)',
+    'Pharmaceutical Licensing (Skill 140)',
+    'Policy Creation (Skill 141)',
+    'Power Purchase Agreements (Skill 142)',
+    'Privacy Compliance (Skill 143)',
+    'Private Company Corporate Governance (Skill 144)',
+    'Private Equity and Venture Capital (Skill 145)',
+    'Private Public Partnerships (P3) (Skill 146)',
+    'Procurement (private) & RFPs (Skill 147)',
+    'Procurement (public) & RFPs (Skill 148)',
+    'Product Labeling and Packaging (Skill 149)',
+    'Product Warranties/Agreement Warranties (Skill 150)',
+    'Professional Services Agreements and related SOWs (Skill 151)',
+    'Prospectus (Skill 152)',
+    'Public Company Corporate Governance (Skill 153)',
+    'Purchase and Sale Agreements (Skill 154)',
+    'Reorganizations (Skill 155)',
+    'Sanctions Law & Compliance (Skill 156)',
+    'Securities and Capital Markets (Skill 157)',
+    'Shareholder and Partnership Agreements (Skill 158)',
+    'Sports Law Agreements (Skill 159)',
+    'State/Local SLED Government Contracting (Skill 160)',
+    'Structured Finance and Securitization (Skill 161)',
+    'Sweepstakes and Contests (Skill 162)',
+    'Technology Licensing—Hardware (Skill 163)',
+    'Technology Licensing—Software/SaaS (Skill 164)',
+    'Terms of Service and User Agreements (Skill 165)',
+    'Trademark and Brand Protection/Prosecution (Skill 166)',
+    'Trademark Law/Portfolio Management (Skill 167)',
+    'Waste Management and Recycling (Skill 168)',
+]
+
+_SUFFIX = re.compile(r"\s*\(Skill (\d+)\)\s*$")
+
+def parse_skill_column(column):
+    """Split a skill column name into (display name, id), with id None if it has no suffix"""
+    match = _SUFFIX.search(column)
+    if match is None:
+        return column.strip(), None
+    return column[:match.start()].strip(), int(match.group(1))
+
+SKILL_IDS = {column: parse_skill_column(column)[1] for column in SKILL_COLUMNS}
+SKILL_NAMES = {skill_id: column for column, skill_id in SKILL_IDS.items()}
+DISPLAY_NAMES = {skill_id: parse_skill_column(column)[0] for column, skill_id in SKILL_IDS.items()}
+
+@lru_cache(maxsize=4096)
+def display_name(column):
+    """Clean display name for any skill column, including historical ones outside the catalogue"""
+    skill_id = SKILL_IDS.get(column)
+    if skill_id is not None:
+        return DISPLAY_NAMES[skill_id]
+    return parse_skill_column(column)[0]
+
+# Practice areas, for grouping the form into sections; every skill id belongs to exactly one
+PRACTICE_AREAS = {
+    "Corporate and M&A": [1, 6, 8, 14, 27, 29, 30, 33, 46, 50, 78, 79, 88, 89, 90, 95, 97, 107, 120, 132, 144,
+                          152, 153, 155, 158],
+    "Banking, Finance and Securities": [9, 10, 11, 18, 23, 39, 42, 69, 73, 74, 104, 105, 106, 112, 139, 145,
+                                        157, 161],
+    "Fintech, Payments and Digital Assets": [13, 34, 45, 75, 76, 127, 138],
+    "Commercial Contracts": [5, 19, 47, 66, 80, 81, 91, 94, 111, 119, 121, 122, 130, 131, 147, 150, 151, 154,
+                             159, 162, 165],
+    "Technology and Intellectual Property": [4, 7, 25, 26, 28, 44, 48, 98, 99, 100, 135, 136, 137, 163, 164,
+                                             166, 167],
+    "Privacy, Data and Cybersecurity": [15, 16, 32, 36, 37, 38, 101, 143],
+    "Advertising, Marketing and Consumer": [2, 3, 24, 43, 51, 149],
+    "Employment, Benefits and Immigration": [40, 52, 53, 54, 55, 56, 57, 58, 59, 60, 68, 70, 77, 82, 86, 87,
+                                             108, 115, 133, 141],
+    "Life Sciences and Healthcare": [12, 17, 83, 84, 113, 124, 125, 140],
+    "Energy, Environment and Natural Resources": [41, 61, 62, 63, 64, 65, 67, 93, 126, 129, 134, 142, 168],
+    "Real Estate and Construction": [20, 22, 109, 110],
+    "Regulatory, Government and Trade": [21, 31, 35, 49, 71, 72, 85, 92, 102, 103, 118, 128, 146, 148, 156,
+                                         160],
+    "Litigation and Disputes": [96, 114, 116, 117, 123],
+}
+
+_unassigned = [skill_id for skill_id in SKILL_NAMES
+               if not any(skill_id in ids for ids in PRACTICE_AREAS.values())]
+if _unassigned:
+    PRACTICE_AREAS["Other"] = _unassigned
+
+def search_skills(query):
+    """Ids of skills whose display name contains query (case-insensitive), in catalogue order"""
+    query = query.strip().lower()
+    return [skill_id for skill_id, name in DISPLAY_NAMES.items() if query in name.lower()]
+
+# Expertise tiers: 0 none, 1 Limited (1-2 points), 2 Secondary (3-7 points), 3 Primary (8-10 points)
+MAX_POINTS_PER_SKILL = 10
+TIER_BY_POINTS = (0, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3)
+TIER_LABELS = ("", "🟡 Limited", "🟢 Secondary", "🔵 Primary")
+
+def tier_of(points):
+    """Tier code for a score, using the lookup table for whole points"""
+    if isinstance(points, int) and 0 <= points <= MAX_POINTS_PER_SKILL:
+        return TIER_BY_POINTS[points]
+    if points >= 8:
+        return 3
+    if points >= 3:
+        return 2
+    if points >= 1:
+        return 1
+    return 0
+
+# Schema versions
+#
+# 1: historical data, where renumbered skills produced extra columns such as
+#    "Advertising Technology (AdTech) (Skill 3)" next to "(Skill 4)" and "Aquisitions (Skill 6)"
+# 2: exactly one column per catalogue skill, in catalogue order, with 0 for unallocated skills
+SCHEMA_VERSION = 2
+
+# Historical spellings of catalogue display names (lower case)
+NAME_ALIASES = {
+    'aquisitions': 'acquisitions',
+}
+
+def _normalize_name(name):
+    name = " ".join(name.lower().split())
+    return NAME_ALIASES.get(name, name)
+
+_IDS_BY_NAME = {_normalize_name(name): skill_id for skill_id, name in DISPLAY_NAMES.items()}
+
+@lru_cache(maxsize=4096)
+def canonical_skill_id(column):
+    """Catalogue id for a current or historical skill column, or None if it matches no skill
+
+    Historical columns are matched by display name, since skill numbers were reshuffled.
+    """
+    skill_id = SKILL_IDS.get(column)
+    if skill_id is not None:
+        return skill_id
+    return _IDS_BY_NAME.get(_normalize_name(parse_skill_column(column)[0]))
+
+def normalize_response(response_data):
+    """Rename any historical skill keys in a submission to their catalogue columns"""
+    normalized = {}
+    for key, value in response_data.items():
+        skill_id = None if key in METADATA_COLUMNS else canonical_skill_id(key)
+        normalized[SKILL_NAMES[skill_id] if skill_id is not None else key] = value
+    return normalized
+
+def migrate_frame(df):
+    """Map historical skill columns onto the catalogue, giving one column per skill"""
+    groups = {}
+    unmapped = []
+    for col in df.columns:
+        if col in METADATA_COLUMNS:
+            continue
+        skill_id = canonical_skill_id(col)
+        if skill_id is None:
+            unmapped.append(col)
+        else:
+            groups.setdefault(skill_id, []).append(col)
+    skills = {}
+    for skill_id, column in SKILL_NAMES.items():
+        # Prefer the current column, then fall back to historical ones in file order
+        sources = sorted(groups.get(skill_id, []), key=lambda col: col != column)
+        if not sources:
+            skills[column] = pd.Series(0.0, index=df.index)
+            continue
+        values = df[sources].apply(pd.to_numeric, errors='coerce')
+        skills[column] = values.bfill(axis=1).iloc[:, 0].fillna(0.0)
+    # Columns that match no skill are kept only if they hold data
+    kept = [col for col in unmapped if df[col].notna().any()]
+    meta_cols = [col for col in METADATA_COLUMNS if col in df.columns]
+    return pd.concat([df[meta_cols], pd.DataFrame(skills, index=df.index), df[kept]], axis=1)
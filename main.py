@@ -6,82 +6,103 @@ import pandas as pd
 from datetime import datetime
 import uuid
 import streamlit.components.v1 as components
-import threading
 import json
-
-file_lock = threading.Lock()
+from io import BytesIO
+from storage import (EXPORT_FORMATS, METADATA_COLUMNS, FileLock, append_json_line, atomic_write,
+                     export_formats, export_responses, get_repository, load_cached, migrate_schema_once,
+                     read_last_json_lines)
+from analytics import AnalyticsSnapshot, cached_summary, filter_responses, skill_matrix
+from reports import build_pdf_report, build_reports, report_cache
+from catalogue import (MAX_POINTS_PER_SKILL, PRACTICE_AREAS, SCHEMA_VERSION, SKILL_COLUMNS, SKILL_NAMES,
+                       TIER_BY_POINTS, TIER_LABELS, display_name, migrate_frame, normalize_response,
+                       search_skills, tier_of)
 
 # Constants
 RESPONSES_FILE = "skills_responses.csv"
-LOG_FILE = "submission_log.json"
+RESPONSES_LOG_FILE = "skills_responses.log"
+RESPONSES_DB_FILE = "skills_responses.db"
+RESPONSES_COLUMNAR_PREFIX = "skills_responses"
+LOG_FILE = "submission_log.jsonl"
+LEGACY_LOG_FILE = "submission_log.json"
+LOG_MAX_ENTRIES = 100
+LOG_REFRESH_SECONDS = 15
+ANALYTICS_FILE = "skills_analytics.json"
+
+# Serializes writers across threads and across Streamlit replicas on the same host
+file_lock = FileLock(f"{RESPONSES_FILE}.lock")
+log_lock = FileLock(f"{LOG_FILE}.lock")
+
+# Skills form widget: "grid" (client-side allocation component, default) or "inputs" (one number_input per skill)
+FORM_WIDGET = os.environ.get("SKILLS_FORM_WIDGET", "grid")
+GRID_DRAFT_DELAY_MS = 1500
+skills_allocation = components.declare_component(
+    "skills_allocation",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "skills_allocation"),
+)
+
+# Storage backend: "log" (append-only, default), "sqlite" (indexed),
+# "columnar" (compact uint8 scores) or "csv" (legacy)
+STORAGE_BACKEND = os.environ.get("SKILLS_STORAGE_BACKEND", "log")
+repository = get_repository(STORAGE_BACKEND, RESPONSES_FILE,
+                            log_path=RESPONSES_LOG_FILE, db_path=RESPONSES_DB_FILE,
+                            columnar_prefix=RESPONSES_COLUMNAR_PREFIX)
 
 # Real-time log functions
 def add_to_log(response_data):
     """Add a submission entry to the real-time log"""
     try:
+        # Score and tier every skill once
+        scores = [(k, v) for k, v in response_data.items()
+                  if k not in METADATA_COLUMNS and isinstance(v, (int, float))]
+        tiers = [tier_of(v) for _, v in scores]
+        
         # Create log entry with timestamp
         log_entry = {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "submitter_name": response_data.get("Submitter Name", "Unknown"),
             "submitter_email": response_data.get("Submitter Email", "Unknown"),
             "response_id": response_data.get("Response ID", "Unknown"),
-            "total_points": sum([v for k, v in response_data.items() 
-                               if k not in ['Response ID', 'Timestamp', 'Submitter Email', 'Submitter Name']
-                               and isinstance(v, (int, float))]),
-            "primary_skills": sum(1 for k, v in response_data.items() 
-                               if k not in ['Response ID', 'Timestamp', 'Submitter Email', 'Submitter Name']
-                               and isinstance(v, (int, float)) and v >= 8),
-            "secondary_skills": sum(1 for k, v in response_data.items() 
-                                 if k not in ['Response ID', 'Timestamp', 'Submitter Email', 'Submitter Name']
-                                 and isinstance(v, (int, float)) and v >= 3 and v < 8),
-            "limited_skills": sum(1 for k, v in response_data.items() 
-                               if k not in ['Response ID', 'Timestamp', 'Submitter Email', 'Submitter Name']
-                               and isinstance(v, (int, float)) and v >= 1 and v < 3),
+            "total_points": sum(v for _, v in scores),
+            "primary_skills": tiers.count(3),
+            "secondary_skills": tiers.count(2),
+            "limited_skills": tiers.count(1),
             # Add top 3 skills with highest points
-            "top_skills": sorted([(k.replace(' (Skill', '').split(')')[0], v) 
-                               for k, v in response_data.items() 
-                               if k not in ['Response ID', 'Timestamp', 'Submitter Email', 'Submitter Name']
-                               and isinstance(v, (int, float)) and v > 0],
-                              key=lambda x: x[1], reverse=True)[:3]
+            "top_skills": sorted([(display_name(k), v) for k, v in scores if v > 0],
+                                 key=lambda x: x[1], reverse=True)[:3]
         }
         
-        # Load existing log
-        log_entries = []
-        if os.path.exists(LOG_FILE) and os.path.getsize(LOG_FILE) > 0:
-            with open(LOG_FILE, 'r') as f:
-                try:
-                    log_entries = json.load(f)
-                except json.JSONDecodeError:
-                    # If file is corrupted, start with empty log
-                    log_entries = []
-        
-        # Add new entry
-        log_entries.append(log_entry)
-        
-        # Keep only the last 100 entries to prevent the file from growing too large
-        log_entries = log_entries[-100:]
-        
-        # Write back to file
-        with open(LOG_FILE, 'w') as f:
-            json.dump(log_entries, f, indent=2)
+        # Append the entry; the log is compacted to the last LOG_MAX_ENTRIES as it grows
+        with log_lock:
+            append_json_line(LOG_FILE, log_entry, keep=LOG_MAX_ENTRIES)
             
         return True
     except Exception as e:
         print(f"Error adding to log: {e}")
         return False
 
-def get_log_entries(limit=50):
-    """Get the most recent log entries, with optional limit"""
+def migrate_legacy_log():
+    """Convert the old JSON-array log file to JSON Lines"""
+    if not os.path.exists(LEGACY_LOG_FILE):
+        return
     try:
-        if os.path.exists(LOG_FILE) and os.path.getsize(LOG_FILE) > 0:
-            with open(LOG_FILE, 'r') as f:
+        with log_lock:
+            if not os.path.exists(LEGACY_LOG_FILE):
+                return
+            with open(LEGACY_LOG_FILE, 'r') as f:
                 try:
-                    log_entries = json.load(f)
-                    # Return the most recent entries, limited by the parameter
-                    return log_entries[-limit:]
+                    legacy_entries = json.load(f)
                 except json.JSONDecodeError:
-                    return []
-        return []
+                    legacy_entries = []
+            entries = legacy_entries[-LOG_MAX_ENTRIES:] + read_last_json_lines(LOG_FILE, LOG_MAX_ENTRIES)
+            atomic_write(LOG_FILE, lambda f: f.writelines(json.dumps(e) + "\n" for e in entries))
+            os.remove(LEGACY_LOG_FILE)
+    except Exception as e:
+        print(f"Error migrating log: {e}")
+
+def get_log_entries(limit=50):
+    """Get the most recent log entries, with optional limit"""
+    try:
+        return read_last_json_lines(LOG_FILE, min(limit, LOG_MAX_ENTRIES))
     except Exception as e:
         print(f"Error reading log: {e}")
         return []
@@ -89,8 +110,8 @@ def get_log_entries(limit=50):
 def clear_log():
     """Clear the log file"""
     try:
-        with open(LOG_FILE, 'w') as f:
-            json.dump([], f)
+        with log_lock:
+            atomic_write(LOG_FILE, lambda f: None)
         return True
     except Exception as e:
         print(f"Error clearing log: {e}")
@@ -112,47 +133,82 @@ def debug_csv_file():
         print(f"Error during debug: {e}")
 
 def load_responses():
-    """Load responses from CSV file with thread-safe file handling"""
+    """Load all responses, served from the process-wide cache while the data is unchanged"""
     try:
-        with file_lock:
-            if os.path.exists(RESPONSES_FILE):
-                df = pd.read_csv(RESPONSES_FILE)
-                return df
-            return pd.DataFrame()  # Return empty DataFrame if file doesn't exist
+        # Writes are atomic appends or renames, so readers don't need the file lock
+        return load_cached(repository)
+    except Exception as e:
+        st.error(f"Error loading responses: {e}")
+        return pd.DataFrame()
+
+def load_user_responses(email):
+    """Load the responses submitted by one email address"""
+    try:
+        return repository.find_by_email(email)
     except Exception as e:
         st.error(f"Error loading responses: {e}")
         return pd.DataFrame()
         
+def data_version():
+    """Current data version of the storage backend in a JSON-friendly form"""
+    return json.dumps(repository.version())
+
+def update_analytics_snapshot(response_data, version_before):
+    """Fold a just-saved response into the persisted analytics snapshot in O(skills)"""
+    snapshot = AnalyticsSnapshot.load(ANALYTICS_FILE)
+    if snapshot is None or snapshot.version != version_before:
+        # Out of date (e.g. after a delete); rebuilt from the full data on the next dashboard render
+        return
+    snapshot.add(response_data, METADATA_COLUMNS)
+    snapshot.version = data_version()
+    atomic_write(ANALYTICS_FILE, lambda f: f.write(snapshot.to_json()))
+
+def get_analytics_snapshot(version):
+    """Return the analytics snapshot for the given data version, rebuilding it if it is stale"""
+    # Shared by every session until the data version changes; must not be modified in place
+    return cached_summary('analytics_snapshot', version, lambda: load_analytics_snapshot(version))
+
+def load_analytics_snapshot(version):
+    """Read the persisted analytics snapshot, rebuilding and saving it if it is stale"""
+    snapshot = AnalyticsSnapshot.load(ANALYTICS_FILE)
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    if hasattr(repository, 'load_sparse'):
+        # Sparse backends aggregate over allocated points only
+        snapshot = AnalyticsSnapshot.from_sparse(*repository.load_sparse(), version)
+    else:
+        # Only a stale snapshot needs the full response frame
+        responses_df = load_responses()
+        skill_cols = [col for col in responses_df.columns if col not in METADATA_COLUMNS]
+        snapshot = AnalyticsSnapshot.from_frame(responses_df, skill_cols, version)
+    try:
+        with file_lock:
+            atomic_write(ANALYTICS_FILE, lambda f: f.write(snapshot.to_json()))
+    except Exception as e:
+        print(f"Error saving analytics snapshot: {e}")
+    return snapshot
+
+def ensure_schema():
+    """Map stored historical skill columns onto the catalogue (a no-op once migrated)"""
+    try:
+        # Streamlit re-executes this script on every rerun, so the done flag lives in storage
+        if migrate_schema_once(repository, SCHEMA_VERSION, migrate_frame, file_lock):
+            print(f"Migrated stored responses to schema version {SCHEMA_VERSION}")
+    except Exception as e:
+        print(f"Error migrating responses: {e}")
+
 def save_response(response_data):
-    """Save response to CSV file with thread-safe file handling and backup, and add to real-time log"""
+    """Save a response through the storage backend and add it to the real-time log"""
     try:
-        # Load existing responses
-        responses_df = load_responses()
-        
-        # Create new response DataFrame
-        new_response = pd.DataFrame([response_data])
-        
-        # If responses_df is empty, use columns from new_response
-        if responses_df.empty:
-            responses_df = pd.DataFrame(columns=new_response.columns)
-        
-        # Ensure columns match
-        all_columns = responses_df.columns.union(new_response.columns)
-        responses_df = responses_df.reindex(columns=all_columns)
-        new_response = new_response.reindex(columns=all_columns)
-        
-        # Concatenate new and existing responses
-        updated_responses = pd.concat([responses_df, new_response], ignore_index=True)
-        
-        # Create backup of existing file
-        if os.path.exists(RESPONSES_FILE):
-            backup_filename = f"{RESPONSES_FILE}.backup"
-            with file_lock:
-                os.replace(RESPONSES_FILE, backup_filename)
-        
-        # Save updated responses
+        # Map any historical skill names onto catalogue columns at ingestion
+        response_data = normalize_response(response_data)
         with file_lock:
-            updated_responses.to_csv(RESPONSES_FILE, index=False)
+            version_before = data_version()
+            repository.add(response_data)
+            try:
+                update_analytics_snapshot(response_data, version_before)
+            except Exception as e:
+                print(f"Error updating analytics snapshot: {e}")
             
         # Add to real-time log
         add_to_log(response_data)
@@ -188,304 +244,353 @@ def check_password():
         st.error("😕 Password incorrect")
     return False
 
-def show_admin_page():
-    """Shows the admin page with download functionality, advanced analytics, and real-time log"""
+def render_log_entries(log_entries):
+    """Render submission log entries, newest first"""
+    if not log_entries:
+        st.info("No log entries found. New submissions will appear here.")
+        return
+    
+    # Create an expander for each log entry
+    for entry in reversed(log_entries):  # Show newest first
+        with st.expander(f"**{entry['timestamp']}** - {entry['submitter_name']} ({entry['submitter_email']})"):
+            # First row: summary information
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.markdown(f"**Response ID:** {entry['response_id']}")
+                st.markdown(f"**Total Points:** {entry['total_points']}")
+            with col2:
+                st.markdown("**Expertise Areas:**")
+                st.markdown(f"🔵 Primary: {entry['primary_skills']}")
+                st.markdown(f"🟢 Secondary: {entry['secondary_skills']}")
+                st.markdown(f"🟡 Limited: {entry['limited_skills']}")
+            with col3:
+                st.markdown("**Top Skills:**")
+                for skill, points in entry['top_skills']:
+                    expertise = TIER_LABELS[tier_of(points)]
+                    st.markdown(f"{expertise}: {skill} ({points} pts)")
+
+def show_live_log(limit, auto_refresh):
+    """Show the submission log as a fragment that refreshes itself without rerunning the page"""
+    def feed():
+        render_log_entries(get_log_entries(limit=limit))
+    
+    st.fragment(feed, run_every=LOG_REFRESH_SECONDS if auto_refresh else None)()
+
+ADMIN_VIEWS = ["Real-time Log", "Raw Data", "Skills Analysis", "Form Submission Trends", "Batch Reports"]
+
+def show_log_view(show_clear=True):
+    """Real-time Log view: controls plus the self-refreshing feed"""
+    st.subheader("Real-time Submission Log")
+    
+    # Add controls for the log
+    if show_clear:
+        col1, col2, col3 = st.columns([1,1,2])
+    else:
+        col1, col2 = st.columns([1,3])
+    with col1:
+        entries_to_show = st.selectbox("Entries to show:", [10, 25, 50, 100], index=1)
+    with col2:
+        auto_refresh = st.checkbox(f"Auto-refresh ({LOG_REFRESH_SECONDS}s)", value=True)
+    if show_clear:
+        with col3:
+            if st.button("Clear Log"):
+                if clear_log():
+                    st.success("Log cleared successfully")
+                else:
+                    st.error("Failed to clear log")
+    
+    # Only the feed reruns on the timer, not the whole admin page
+    show_live_log(entries_to_show, auto_refresh)
+
+RAW_DATA_PAGE_SIZES = [25, 50, 100, 250]
+RAW_DATA_PROJECTIONS = ["Non-zero skills", "All skills", "Chosen skills"]
+
+def project_skill_columns(page_df, skill_cols, projection, chosen=()):
+    """Pick the skill columns to show for one page of responses"""
+    if projection == "All skills":
+        return list(skill_cols)
+    if projection == "Chosen skills":
+        return [col for col in skill_cols if col in set(chosen)]
+    # Only skills with points on this page, so the payload is bounded by the page size
+    values = skill_matrix(page_df, skill_cols)
+    return [col for col, used in zip(skill_cols, values.any(axis=0)) if used]
+
+def show_raw_data_view(responses_df):
+    """Raw Data view: one filtered page of responses with metadata columns first"""
+    st.subheader("Raw Response Data")
+    metadata_cols = ['Response ID', 'Timestamp', 'Submitter Email', 'Submitter Name']
+    skill_cols = [col for col in responses_df.columns if col not in metadata_cols]
+    
+    # Filters are applied on the server; only the current page is sent to the browser
+    col1, col2, col3 = st.columns([2,1,1])
+    with col1:
+        query = st.text_input("Search name or email:", key='raw_query')
+    with col2:
+        start_date = st.date_input("From:", value=None, key='raw_start')
+    with col3:
+        end_date = st.date_input("To:", value=None, key='raw_end')
+    
+    col1, col2 = st.columns([1,3])
+    with col1:
+        projection = st.selectbox("Skill columns:", RAW_DATA_PROJECTIONS, key='raw_projection')
+    chosen = []
+    if projection == "Chosen skills":
+        with col2:
+            chosen = st.multiselect("Skills:", skill_cols, format_func=display_name, key='raw_chosen')
+    
+    rows = filter_responses(responses_df, query, start_date, end_date)
+    if len(rows) == 0:
+        st.info("No responses match the filters.")
+        return
+    
+    # Newest submissions first
+    rows = rows[::-1]
+    col1, col2, col3 = st.columns([1,1,2])
+    with col1:
+        page_size = st.selectbox("Rows per page:", RAW_DATA_PAGE_SIZES, key='raw_page_size')
+    pages = (len(rows) + page_size - 1) // page_size
+    if st.session_state.get('raw_page', 1) > pages:
+        # Keep the page in range when a filter shrinks the result
+        st.session_state['raw_page'] = pages
+    with col2:
+        page = st.number_input("Page:", min_value=1, max_value=pages, step=1, key='raw_page')
+    with col3:
+        st.caption(f"{len(rows)} matching responses, page {page} of {pages}")
+    
+    page_df = responses_df.iloc[rows[(page - 1) * page_size:page * page_size]]
+    shown_skills = project_skill_columns(page_df, skill_cols, projection, chosen)
+    st.dataframe(page_df[metadata_cols + shown_skills], hide_index=True)
+
+def skills_analysis_summary(snapshot):
+    """Tables and figures for the Skills Analysis view"""
     import plotly.express as px
+    
+    # Expertise distribution and skills x tier counts from the snapshot
+    expertise_averages = snapshot.average_skills_per_person()
+    skill_tiers = snapshot.tier_counts()
+    
+    avg_stats = pd.DataFrame({
+        'Expertise Level': ['Primary', 'Secondary', 'Limited'],
+        'Average Skills': [
+            f"{expertise_averages['Primary']:.1f}",
+            f"{expertise_averages['Secondary']:.1f}",
+            f"{expertise_averages['Limited']:.1f}"
+        ],
+        'Color': ['🔵', '🟢', '🟡']
+    })
+    
+    # Get top skills for each level (first skill wins ties)
+    top_skills = {}
+    for level in ['Primary', 'Secondary', 'Limited']:
+        counts = skill_tiers[level]
+        if not counts.empty and counts.max() > 0:
+            top_skills[level] = (counts.idxmax(), int(counts.max()))
+    
+    top_skills_df = pd.DataFrame({
+        'Expertise Level': ['Primary 🔵', 'Secondary 🟢', 'Limited 🟡'],
+        'Most Common Skill': [
+            f"{top_skills.get('Primary', ('None', 0))[0]} ({top_skills.get('Primary', ('None', 0))[1]})",
+            f"{top_skills.get('Secondary', ('None', 0))[0]} ({top_skills.get('Secondary', ('None', 0))[1]})",
+            f"{top_skills.get('Limited', ('None', 0))[0]} ({top_skills.get('Limited', ('None', 0))[1]})"
+        ]
+    })
+    
+    # Average points visualization
+    avg_points = snapshot.average_points().sort_values(ascending=False)
+    
+    # Create a bar chart for average points with color coding
+    fig = px.bar(
+        x=avg_points.index,
+        y=avg_points.values,
+        color=avg_points.values,
+        color_continuous_scale=[[0, '#FFE5B4'],  # Light yellow for limited
+                              [0.3, '#90EE90'],  # Green for secondary
+                              [0.8, '#4169E1']], # Blue for primary
+        title='Average Points by Skill'
+    )
+    fig.update_layout(showlegend=False, xaxis_tickangle=-45)
+    
+    # Most common primary expertise areas
+    fig2 = None
+    primary_counts = skill_tiers['Primary']
+    primary_expertise = primary_counts[primary_counts > 0].to_frame('Count')
+    
+    if not primary_expertise.empty:
+        primary_expertise = primary_expertise.sort_values('Count', ascending=False)
+        fig2 = px.bar(
+            x=primary_expertise.index,
+            y=primary_expertise['Count'],
+            color=primary_expertise['Count'],
+            color_continuous_scale=[[0, '#4169E1'], [1, '#4169E1']],  # Blue for primary expertise
+            title='Number of Primary Expertise Areas'
+        )
+        fig2.update_layout(showlegend=False, xaxis_tickangle=-45)
+    
+    return avg_stats, top_skills_df, fig, fig2
+
+def show_skills_analysis_view(snapshot, version):
+    """Skills Analysis view, computed once per data version"""
+    avg_stats, top_skills_df, fig, fig2 = cached_summary(
+        'skills_analysis', version, lambda: skills_analysis_summary(snapshot))
+    
+    # Summary statistics table
+    st.subheader("Summary Statistics")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Average Skills per Person:**")
+        st.table(avg_stats)
+    with col2:
+        st.markdown("**Top Skills by Expertise Level:**")
+        st.table(top_skills_df)
+    
+    st.subheader("Average Points by Skill")
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Show top skills with color coding
+    st.subheader("Most Common Primary Expertise Areas")
+    if fig2 is not None:
+        st.plotly_chart(fig2, use_container_width=True)
+
+def submission_trends_summary(snapshot):
+    """Figures for the Form Submission Trends view"""
     import plotly.graph_objects as go
+    
+    # Daily submissions
+    daily_submissions = snapshot.daily_submissions()
+    
+    # Daily submissions with color
+    fig4 = go.Figure()
+    fig4.add_trace(go.Scatter(
+        x=daily_submissions['Date'],
+        y=daily_submissions['Submissions'],
+        mode='lines+markers',
+        name='Daily Submissions',
+        line=dict(color='#4169E1')  # Blue
+    ))
+    fig4.update_layout(title='Daily Submissions')
+    
+    # Cumulative submissions with color
+    daily_submissions['Cumulative'] = daily_submissions['Submissions'].cumsum()
+    fig5 = go.Figure()
+    fig5.add_trace(go.Scatter(
+        x=daily_submissions['Date'],
+        y=daily_submissions['Cumulative'],
+        mode='lines+markers',
+        name='Cumulative Submissions',
+        line=dict(color='#90EE90')  # Green
+    ))
+    fig5.update_layout(title='Cumulative Submissions Over Time')
+    return fig4, fig5
+
+def show_trends_view(snapshot, version):
+    """Form Submission Trends view, computed once per data version"""
+    fig4, fig5 = cached_summary('submission_trends', version, lambda: submission_trends_summary(snapshot))
+    
+    st.subheader("Submission Trends")
+    st.plotly_chart(fig4, use_container_width=True)
+    
+    st.subheader("Cumulative Submissions")
+    st.plotly_chart(fig5, use_container_width=True)
+
+def show_batch_reports_view(responses_df):
+    """Batch Reports view: build PDF reports for every matching respondent into one zip"""
+    st.subheader("Batch PDF Reports")
+    
+    col1, col2, col3, col4 = st.columns([2,1,1,1])
+    with col1:
+        query = st.text_input("Search name or email:", key='batch_query')
+    with col2:
+        start_date = st.date_input("From:", value=None, key='batch_start')
+    with col3:
+        end_date = st.date_input("To:", value=None, key='batch_end')
+    with col4:
+        processes = st.number_input("Processes:", min_value=1, max_value=os.cpu_count() or 1,
+                                    value=os.cpu_count() or 1, step=1, key='batch_processes')
+    
+    rows = filter_responses(responses_df, query, start_date, end_date)
+    respondents = set(responses_df['Submitter Email'].iloc[rows])
+    st.caption(f"{len(respondents)} respondents match the filters")
+    
+    if st.button("Build Reports", disabled=not respondents):
+        buffer = BytesIO()
+        with st.spinner("Building reports..."):
+            count, elapsed = build_reports(responses_df, buffer, respondents, processes)
+        st.session_state['batch_reports'] = (buffer.getvalue(), count, elapsed)
+    
+    if 'batch_reports' in st.session_state:
+        archive, count, elapsed = st.session_state['batch_reports']
+        st.success(f"Built {count} reports in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.1f} reports/s)")
+        st.download_button(
+            "📥 Download Reports (zip)",
+            archive,
+            f"skills_reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+            "application/zip",
+            key='download-reports'
+        )
+
+def show_admin_page():
+    """Shows the admin page with download functionality, advanced analytics, and real-time log"""
     st.header("Admin Dashboard")
     
-    # Load responses from file
-    responses_df = load_responses()
+    # Read the data version first so the snapshot is never newer than its key
+    version = data_version()
     
-    if not responses_df.empty:
-        # Define metadata columns to exclude from skills analysis
-        metadata_cols = ['Response ID', 'Timestamp', 'Submitter Email', 'Submitter Name']
-        
+    # Summary numbers come from the running analytics snapshot instead of a full scan
+    snapshot = get_analytics_snapshot(version)
+    
+    if snapshot.responses:
         # Top section with key metrics and download
         col1, col2, col3 = st.columns([1,1,2])
         with col1:
-            st.metric("Total Submissions", len(responses_df))
+            st.metric("Total Submissions", snapshot.responses)
         with col2:
-            st.metric("Unique Participants", len(responses_df['Submitter Email'].unique()))
+            st.metric("Unique Participants", snapshot.unique_participants())
         with col3:
             # Download button side by side
             subcol1, subcol2 = st.columns(2)
             with subcol1:
+                export_format = st.selectbox("Export format:", export_formats(), key='export_format',
+                                             label_visibility="collapsed")
+                file_name, mime = EXPORT_FORMATS[export_format]
+                # The export is only built when the button is clicked, from the current data
                 st.download_button(
                     "📥 Download All Responses",
-                    responses_df.to_csv(index=False),
-                    "skills_responses.csv",
-                    "text/csv",
+                    lambda: export_responses(load_responses(), export_format),
+                    file_name,
+                    mime,
                     key='download-csv'
                 )
             with subcol2:
                 if st.button("🔄 Refresh Data"):
                     st.rerun()
         
-        # Tabs for different analysis views
-        tab1, tab2, tab3, tab4 = st.tabs(["Real-time Log", "Raw Data", "Skills Analysis", "Form Submission Trends"])
-        
-        # Tab 1: Real-time Log
-        with tab1:
-            st.subheader("Real-time Submission Log")
-            
-            # Add controls for the log
-            col1, col2, col3 = st.columns([1,1,2])
-            with col1:
-                entries_to_show = st.selectbox("Entries to show:", [10, 25, 50, 100], index=1)
-            with col2:
-                auto_refresh = st.checkbox("Auto-refresh (15s)", value=True)
-            with col3:
-                if st.button("Clear Log"):
-                    if clear_log():
-                        st.success("Log cleared successfully")
-                    else:
-                        st.error("Failed to clear log")
-            
-            # Get log entries
-            log_entries = get_log_entries(limit=entries_to_show)
-            
-            if log_entries:
-                # Create an expander for each log entry
-                for entry in reversed(log_entries):  # Show newest first
-                    with st.expander(f"**{entry['timestamp']}** - {entry['submitter_name']} ({entry['submitter_email']})"):
-                        # First row: summary information
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.markdown(f"**Response ID:** {entry['response_id']}")
-                            st.markdown(f"**Total Points:** {entry['total_points']}")
-                        with col2:
-                            st.markdown("**Expertise Areas:**")
-                            st.markdown(f"🔵 Primary: {entry['primary_skills']}")
-                            st.markdown(f"🟢 Secondary: {entry['secondary_skills']}")
-                            st.markdown(f"🟡 Limited: {entry['limited_skills']}")
-                        with col3:
-                            st.markdown("**Top Skills:**")
-                            for skill, points in entry['top_skills']:
-                                expertise = "🔵 Primary" if points >= 8 else "🟢 Secondary" if points >= 3 else "🟡 Limited"
-                                st.markdown(f"{expertise}: {skill} ({points} pts)")
-            else:
-                st.info("No log entries found. New submissions will appear here.")
-            
-            # Add auto-refresh JavaScript
-            if auto_refresh:
-                st.markdown("""
-                <script>
-                    setTimeout(function(){
-                        window.location.reload();
-                    }, 15000);
-                </script>
-                """, unsafe_allow_html=True)
+        # Unlike st.tabs, only the selected view is computed and rendered
+        view = st.radio("View", ADMIN_VIEWS, horizontal=True, key='admin_view',
+                        label_visibility="collapsed")
         
-        # Tab 2: Raw Data (formerly Tab 1)
-        with tab2:
-            st.subheader("Raw Response Data")
-            # Reorder columns to show metadata first
-            metadata_cols = ['Response ID', 'Timestamp', 'Submitter Email', 'Submitter Name']
-            other_cols = [col for col in responses_df.columns if col not in metadata_cols]
-            ordered_cols = metadata_cols + other_cols
-            st.dataframe(responses_df[ordered_cols])
-            
-        # Tab 3: Skills Analysis (formerly Tab 2)
-        with tab3:
-            # Calculate skill columns (excluding metadata columns)
-            skill_cols = [col for col in responses_df.columns if col not in metadata_cols]
-            
-            # Summary statistics table
-            st.subheader("Summary Statistics")
-            col1, col2 = st.columns(2)
-            
-            # Calculate expertise distribution
-            def get_expertise_counts(row):
-                try:
-                    primary = sum(1 for x in row if isinstance(x, (int, float)) and x >= 8)
-                    secondary = sum(1 for x in row if isinstance(x, (int, float)) and 3 <= x < 8)
-                    limited = sum(1 for x in row if isinstance(x, (int, float)) and 1 <= x < 3)
-                    return pd.Series({'Primary': primary, 'Secondary': secondary, 'Limited': limited})
-                except Exception as e:
-                    print(f"Error processing row: {row}")
-                    return pd.Series({'Primary': 0, 'Secondary': 0, 'Limited': 0})
-            
-            expertise_dist = responses_df[skill_cols].apply(get_expertise_counts, axis=1)
-            
-            with col1:
-                st.markdown("**Average Skills per Person:**")
-                avg_stats = pd.DataFrame({
-                    'Expertise Level': ['Primary', 'Secondary', 'Limited'],
-                    'Average Skills': [
-                        f"{expertise_dist['Primary'].mean():.1f}",
-                        f"{expertise_dist['Secondary'].mean():.1f}",
-                        f"{expertise_dist['Limited'].mean():.1f}"
-                    ],
-                    'Color': ['🔵', '🟢', '🟡']
-                })
-                st.table(avg_stats)
-            
-            with col2:
-                st.markdown("**Top Skills by Expertise Level:**")
-                # Get top skills for each level
-                top_skills = {}
-                for skill in skill_cols:
-                    primary_count = len(responses_df[responses_df[skill] >= 8])
-                    secondary_count = len(responses_df[(responses_df[skill] >= 3) & (responses_df[skill] < 8)])
-                    limited_count = len(responses_df[(responses_df[skill] > 0) & (responses_df[skill] < 3)])
-                    
-                    if primary_count > 0:
-                        if 'Primary' not in top_skills or top_skills['Primary'][1] < primary_count:
-                            top_skills['Primary'] = (skill, primary_count)
-                    if secondary_count > 0:
-                        if 'Secondary' not in top_skills or top_skills['Secondary'][1] < secondary_count:
-                            top_skills['Secondary'] = (skill, secondary_count)
-                    if limited_count > 0:
-                        if 'Limited' not in top_skills or top_skills['Limited'][1] < limited_count:
-                            top_skills['Limited'] = (skill, limited_count)
-                
-                top_skills_df = pd.DataFrame({
-                    'Expertise Level': ['Primary 🔵', 'Secondary 🟢', 'Limited 🟡'],
-                    'Most Common Skill': [
-                        f"{top_skills.get('Primary', ('None', 0))[0]} ({top_skills.get('Primary', ('None', 0))[1]})",
-                        f"{top_skills.get('Secondary', ('None', 0))[0]} ({top_skills.get('Secondary', ('None', 0))[1]})",
-                        f"{top_skills.get('Limited', ('None', 0))[0]} ({top_skills.get('Limited', ('None', 0))[1]})"
-                    ]
-                })
-                st.table(top_skills_df)
-
-            # Average points visualization
-            st.subheader("Average Points by Skill")
-            avg_points = responses_df[skill_cols].mean().sort_values(ascending=False)
-            
-            # Create a bar chart for average points with color coding
-            fig = px.bar(
-                x=avg_points.index,
-                y=avg_points.values,
-                color=avg_points.values,
-                color_continuous_scale=[[0, '#FFE5B4'],  # Light yellow for limited
-                                      [0.3, '#90EE90'],  # Green for secondary
-                                      [0.8, '#4169E1']], # Blue for primary
-                title='Average Points by Skill'
-            )
-            fig.update_layout(showlegend=False, xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Show top skills with color coding
-            st.subheader("Most Common Primary Expertise Areas")
-            primary_expertise = pd.DataFrame()
-            for skill in skill_cols:
-                primary_count = len(responses_df[responses_df[skill] >= 8])
-                if primary_count > 0:
-                    primary_expertise.at[skill, 'Count'] = primary_count
-            
-            if not primary_expertise.empty:
-                primary_expertise = primary_expertise.sort_values('Count', ascending=False)
-                fig2 = px.bar(
-                    x=primary_expertise.index,
-                    y=primary_expertise['Count'],
-                    color=primary_expertise['Count'],
-                    color_continuous_scale=[[0, '#4169E1'], [1, '#4169E1']],  # Blue for primary expertise
-                    title='Number of Primary Expertise Areas'
-                )
-                fig2.update_layout(showlegend=False, xaxis_tickangle=-45)
-                st.plotly_chart(fig2, use_container_width=True)
-        
-        # Tab 4: Form Submission Trends (formerly Tab 3)
-        with tab4:
-            st.subheader("Submission Trends")
-            
-            # Convert timestamp to datetime if it's not already
-            responses_df['Timestamp'] = pd.to_datetime(responses_df['Timestamp'])
-            
-            # Daily submissions
-            daily_submissions = responses_df.groupby(responses_df['Timestamp'].dt.date).size().reset_index()
-            daily_submissions.columns = ['Date', 'Submissions']
-            
-            # Daily submissions with color
-            fig4 = go.Figure()
-            fig4.add_trace(go.Scatter(
-                x=daily_submissions['Date'],
-                y=daily_submissions['Submissions'],
-                mode='lines+markers',
-                name='Daily Submissions',
-                line=dict(color='#4169E1')  # Blue
-            ))
-            fig4.update_layout(title='Daily Submissions')
-            st.plotly_chart(fig4, use_container_width=True)
-            
-            # Cumulative submissions with color
-            st.subheader("Cumulative Submissions")
-            daily_submissions['Cumulative'] = daily_submissions['Submissions'].cumsum()
-            fig5 = go.Figure()
-            fig5.add_trace(go.Scatter(
-                x=daily_submissions['Date'],
-                y=daily_submissions['Cumulative'],
-                mode='lines+markers',
-                name='Cumulative Submissions',
-                line=dict(color='#90EE90')  # Green
-            ))
-            fig5.update_layout(title='Cumulative Submissions Over Time')
-            st.plotly_chart(fig5, use_container_width=True)
+        if view == "Real-time Log":
+            show_log_view()
+        elif view == "Raw Data":
+            # Only the views that list individual responses load the full frame
+            show_raw_data_view(load_responses())
+        elif view == "Skills Analysis":
+            show_skills_analysis_view(snapshot, version)
+        elif view == "Form Submission Trends":
+            show_trends_view(snapshot, version)
+        else:
+            show_batch_reports_view(load_responses())
             
     else:
         st.info("No responses collected yet.")
-        # Still show the real-time log tab even when no responses are in CSV
-        tab1, tab2 = st.tabs(["Real-time Log", "Raw Data"])
-        
-        with tab1:
-            st.subheader("Real-time Submission Log")
-            
-            # Controls for the log
-            col1, col2 = st.columns([1,3])
-            with col1:
-                entries_to_show = st.selectbox("Entries to show:", [10, 25, 50, 100], index=1)
-            with col2:
-                auto_refresh = st.checkbox("Auto-refresh (15s)", value=True)
-            
-            # Get log entries
-            log_entries = get_log_entries(limit=entries_to_show)
-            
-            if log_entries:
-                # Create an expander for each log entry
-                for entry in reversed(log_entries):  # Show newest first
-                    with st.expander(f"**{entry['timestamp']}** - {entry['submitter_name']} ({entry['submitter_email']})"):
-                        # Display entry details
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.markdown(f"**Response ID:** {entry['response_id']}")
-                            st.markdown(f"**Total Points:** {entry['total_points']}")
-                        with col2:
-                            st.markdown("**Expertise Areas:**")
-                            st.markdown(f"🔵 Primary: {entry['primary_skills']}")
-                            st.markdown(f"🟢 Secondary: {entry['secondary_skills']}")
-                            st.markdown(f"🟡 Limited: {entry['limited_skills']}")
-                        with col3:
-                            st.markdown("**Top Skills:**")
-                            for skill, points in entry['top_skills']:
-                                expertise = "🔵 Primary" if points >= 8 else "🟢 Secondary" if points >= 3 else "🟡 Limited"
-                                st.markdown(f"{expertise}: {skill} ({points} pts)")
-            else:
-                st.info("No log entries found. New submissions will appear here.")
-            
-            # Add auto-refresh JavaScript
-            if auto_refresh:
-                st.markdown("""
-                <script>
-                    setTimeout(function(){
-                        window.location.reload();
-                    }, 15000);
-                </script>
-                """, unsafe_allow_html=True)
+        # Still show the real-time log even when no responses are stored
+        show_log_view(show_clear=False)
         
 # Helper functions for admin operations
 def delete_response_by_id(response_id):
     """Delete a specific response by its ID"""
     try:
-        responses_df = load_responses()
-        
-        # Remove the response with the matching ID
-        updated_responses = responses_df[responses_df['Response ID'] != response_id]
-        
-        # Save the updated responses
         with file_lock:
-            updated_responses.to_csv(RESPONSES_FILE, index=False)
+            repository.delete(response_id)
         
         st.success(f"Response {response_id} deleted successfully.")
         return True
@@ -494,16 +599,10 @@ def delete_response_by_id(response_id):
         return False
 
 def clear_all_responses():
-    """Clear all responses from the CSV file"""
+    """Clear all responses from the storage backend"""
     try:
-        # Create an empty DataFrame with the correct columns
-        empty_df = pd.DataFrame(
-            columns=['Response ID', 'Timestamp', 'Submitter Name', 'Submitter Email']
-        )
-        
-        # Save the empty DataFrame
         with file_lock:
-            empty_df.to_csv(RESPONSES_FILE, index=False)
+            repository.clear()
         
         st.success("All responses have been cleared.")
         return True
@@ -513,117 +612,27 @@ def clear_all_responses():
 
 def create_pdf_report(submitter_name, submitter_email):
     """Create a PDF version of the skills report"""
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    from io import BytesIO
-    import pandas as pd
-    from datetime import datetime
-
-    # Create a BytesIO buffer to receive PDF data
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
-    
-    # Container for the 'Flowable' objects
-    elements = []
-    styles = getSampleStyleSheet()
-    
     # Load data
-    df = pd.read_csv("skills_responses.csv")
-    user_response = df[df['Submitter Email'] == submitter_email].iloc[-1]
-    
-    # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30
-    )
-    elements.append(Paragraph(f"Skills Matrix Report", title_style))
-    elements.append(Paragraph(f"Generated for: {submitter_name}", styles['Heading2']))
-    elements.append(Paragraph(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-    elements.append(Spacer(1, 20))
+    version = data_version()
+    # Stored responses are migrated to the catalogue's columns, so no full load is needed
+    skill_cols = SKILL_COLUMNS
+    user_df = load_user_responses(submitter_email).reindex(columns=METADATA_COLUMNS + skill_cols)
+    user_response = user_df.iloc[-1]
     
-    # Get metadata columns
-    metadata_cols = ['Response ID', 'Timestamp', 'Submitter Email', 'Submitter Name']
-    skill_cols = [col for col in df.columns if col not in metadata_cols]
-    
-    # Calculate team averages
-    team_df = df[df['Submitter Email'] != submitter_email]
-    team_averages = team_df[skill_cols].mean()
-    
-    # Categorize skills
-    expertise_categories = {
-        'Primary Expertise (8-10 points)': [],
-        'Secondary Expertise (3-7 points)': [],
-        'Limited Experience (1-2 points)': []
-    }
+    # Team averages from the snapshot's running sums minus the user's own responses
+    team_averages = get_analytics_snapshot(version).leave_one_out_averages(user_df, skill_cols)
     
-    for skill in skill_cols:
-        value = user_response[skill]
-        skill_name = skill.replace(' (Skill', '').split(')')[0]
-        team_avg = team_averages[skill]
-        
-        if value >= 8:
-            expertise_categories['Primary Expertise (8-10 points)'].append(
-                (skill_name, value, team_avg)
-            )
-        elif value >= 3:
-            expertise_categories['Secondary Expertise (3-7 points)'].append(
-                (skill_name, value, team_avg)
-            )
-        elif value >= 1:
-            expertise_categories['Limited Experience (1-2 points)'].append(
-                (skill_name, value, team_avg)
-            )
-    
-    # Add each category to the PDF
-    for category, skills in expertise_categories.items():
-        if skills:
-            # Add category header
-            elements.append(Spacer(1, 20))
-            elements.append(Paragraph(category, styles['Heading2']))
-            elements.append(Spacer(1, 10))
-            
-            # Create table data
-            table_data = [['Skill', 'Your Score', 'Team Average']]
-            for skill_name, value, team_avg in sorted(skills, key=lambda x: x[1], reverse=True):
-                table_data.append([
-                    skill_name,
-                    f"{value:.1f}",
-                    f"{team_avg:.1f}"
-                ])
-            
-            # Create and style the table
-            table = Table(table_data, colWidths=[4*inch, 1*inch, 1.5*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 12),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 3),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-            ]))
-            elements.append(table)
-            elements.append(Spacer(1, 10))
-    
-    # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
+    return BytesIO(build_pdf_report(submitter_name, user_response, skill_cols, team_averages))
+
+def get_pdf_report(submitter_name, submitter_email, response_id):
+    """Return the PDF report bytes, building them at most once per response and data version"""
+    # Read the version before building so a concurrent submission only causes a rebuild
+    version = data_version()
+    pdf = report_cache.get(response_id, version)
+    if pdf is None:
+        pdf = create_pdf_report(submitter_name, submitter_email).getvalue()
+        report_cache.put(response_id, version, pdf, size=len(pdf))
+    return pdf
 
 def generate_skills_report(submitter_name, submitter_email):
     """Generate a skills report for the user who just submitted"""
@@ -635,30 +644,25 @@ def generate_skills_report(submitter_name, submitter_email):
     
     # Load the responses
     try:
-        df = pd.read_csv("skills_responses.csv")
+        version = data_version()
         
-        # Find the user's response - Fix the out-of-bounds error
-        user_df = df[df['Submitter Email'] == submitter_email]
+        # Find the user's response with an indexed lookup by email
+        user_df = load_user_responses(submitter_email)
         
         if user_df.empty:
             st.error(f"No data found for {submitter_email}. Your submission may not have been saved properly.")
             return None
             
         # Get the most recent submission if multiple exist
-        user_response = user_df.iloc[-1]  
-        
-        # Get metadata columns
-        metadata_cols = ['Response ID', 'Timestamp', 'Submitter Email', 'Submitter Name']
-        skill_cols = [col for col in df.columns if col not in metadata_cols]
+        # Stored responses are migrated to the catalogue's columns, so no full load is needed
+        skill_cols = SKILL_COLUMNS
+        user_df = user_df.reindex(columns=METADATA_COLUMNS + skill_cols)
+        user_response = user_df.iloc[-1]
         
-        # Calculate team averages (excluding the current user)
-        team_df = df[df['Submitter Email'] != submitter_email]
-        
-        # If there are no other submissions yet, use zeros for team averages
-        if team_df.empty:
-            team_averages = pd.Series(0, index=skill_cols)
-        else:
-            team_averages = team_df[skill_cols].mean()
+        # Team averages excluding the current user: the snapshot's running sums and counts
+        # minus the user's own responses (zeros if there are no other submissions yet)
+        snapshot = get_analytics_snapshot(version)
+        team_averages = snapshot.leave_one_out_averages(user_df, skill_cols)
         
         # Create user skills dictionary
         user_skills = {
@@ -668,14 +672,12 @@ def generate_skills_report(submitter_name, submitter_email):
         }
         
         # Categorize skills
+        tier_categories = {3: 'Primary', 2: 'Secondary', 1: 'Limited'}
         for skill in skill_cols:
             value = user_response[skill]
-            if value >= 8:
-                user_skills['Primary'].append((skill, value))
-            elif value >= 3:
-                user_skills['Secondary'].append((skill, value))
-            elif value >= 1:
-                user_skills['Limited'].append((skill, value))
+            tier = tier_of(value)
+            if tier:
+                user_skills[tier_categories[tier]].append((skill, value))
                 
         # Sort skills by value within each category
         for category in user_skills:
@@ -686,12 +688,12 @@ def generate_skills_report(submitter_name, submitter_email):
         st.markdown(f"### Generated for: {submitter_name}")
         st.markdown(f"Submission Date: {user_response['Timestamp']}")
         
-        # Add download button for PDF report
+        # Add download button for PDF report; the PDF is built on the first click and then reused
         try:
-            pdf_buffer = create_pdf_report(submitter_name, submitter_email)
+            response_id = user_response['Response ID']
             st.download_button(
                 label="📥 Download PDF Report",
-                data=pdf_buffer,
+                data=lambda: get_pdf_report(submitter_name, submitter_email, response_id),
                 file_name=f"skills_matrix_report_{submitter_name.replace(' ', '_')}.pdf",
                 mime="application/pdf",
             )
@@ -703,7 +705,7 @@ def generate_skills_report(submitter_name, submitter_email):
         if top_skills:
             try:
                 radar_data = {
-                    'Skill': [skill[0].replace(' (Skill', '').split(')')[0] for skill in top_skills],
+                    'Skill': [display_name(skill[0]) for skill in top_skills],
                     'Your Score': [skill[1] for skill in top_skills],
                     'Team Average': [team_averages.get(skill[0], 0) for skill in top_skills]  # Use .get with default value
                 }
@@ -750,7 +752,7 @@ def generate_skills_report(submitter_name, submitter_email):
                 st.markdown(f"### {title}")
                 for skill, value in user_skills[category]:
                     # Remove the skill number suffix for cleaner display
-                    skill_name = skill.replace(' (Skill', '').split(')')[0]
+                    skill_name = display_name(skill)
                     
                     # Get team average for comparison - handle potential key errors
                     try:
@@ -779,20 +781,19 @@ def generate_skills_report(submitter_name, submitter_email):
         st.exception(e)  # Show detailed exception info
         return None
 
-def update_total_points():
-    """Update the total points in session state"""
-    total = 0
-    for skill in st.session_state.skills.keys():
-        input_key = f"input_{skill}"
-        if input_key in st.session_state:
-            try:
-                value = float(st.session_state[input_key])
-                if value.is_integer():
-                    total += int(value)
-                else:
-                    total += value
-            except (ValueError, TypeError):
-                continue
+def update_total_points(skill_id):
+    """Apply one skill's change to the running total in session state"""
+    skill = SKILL_NAMES[skill_id]
+    try:
+        value = float(st.session_state[f"input_{skill_id}"])
+    except (KeyError, ValueError, TypeError):
+        value = 0.0
+    if value.is_integer():
+        value = int(value)
+    
+    # O(1): add the changed field's delta instead of re-summing every input
+    total = st.session_state.total_points + value - st.session_state.skills.get(skill, 0)
+    st.session_state.skills[skill] = value
     st.session_state.total_points = round(total, 1)  # Round to 1 decimal place for consistency
     
     # Show modal when hitting 120 points
@@ -802,21 +803,140 @@ def update_total_points():
     elif total < 120:
         st.session_state.modal_shown = False
 
+def recount_total_points():
+    """Re-sum the total from every allocated skill"""
+    total = sum(float(value) for value in st.session_state.skills.values() if not pd.isna(value))
+    st.session_state.total_points = round(total, 1)
+    return st.session_state.total_points
+
+def show_skill_input(skill_id, max_total):
+    """Render one skill's row: name, points input and expertise level"""
+    skill = SKILL_NAMES[skill_id]
+    col1, col2, col3 = st.columns([3, 1, 1])
+    
+    with col1:
+        st.markdown(f"**{skill}**")
+    
+    # Calculate maximum points available for this skill; the allocation in session state is kept
+    # while the widget is not rendered, so it is the source of the current value
+    current_skill_points = st.session_state.skills.get(skill, 0)
+    remaining_points = max_total - (st.session_state.total_points - current_skill_points)
+    points_available = min(MAX_POINTS_PER_SKILL, remaining_points)
+    
+    value = current_skill_points
+    with col2:
+        try:
+            value = st.number_input(
+                f"{skill} points",
+                min_value=0,
+                max_value=points_available,
+                value=current_skill_points,
+                key=f"input_{skill_id}",
+                on_change=update_total_points,
+                args=(skill_id,),
+                help="You've used all 120 points. To add points here, first reduce points in other skills." if st.session_state.total_points >= max_total and current_skill_points == 0 else None
+            )
+            st.session_state.skills[skill] = value
+        except:
+            if st.session_state.total_points >= max_total:
+                st.error("You've used all 120 points. To add points here, first reduce points in other skills.")
+    
+    with col3:
+        st.markdown(get_expertise_level(value))
+
 def get_expertise_level(value):
     """Return expertise level emoji based on value"""
-    if value >= 8:
-        return "🔵 Primary"
-    elif value >= 3:
-        return "🟢 Secondary"
-    elif value >= 1:
-        return "🟡 Limited"
-    return ""
+    return TIER_LABELS[tier_of(value)]
 
 def is_email_unique(email):
     """Remove email uniqueness check, allowing multiple submissions"""
     return True
 
-def show_skills_form(submitter_email, submitter_name):
+def allocation_from_component(allocation, max_total=120):
+    """Validate an allocation sent by the grid component and return it as {skill column: points}
+
+    A max_total of None skips the total check, for drafts.
+    """
+    skills = {column: 0 for column in SKILL_COLUMNS}
+    for skill_id, points in (allocation or {}).items():
+        column = SKILL_NAMES.get(int(skill_id)) if str(skill_id).isdigit() else None
+        if column is None:
+            raise ValueError(f"Unknown skill id: {skill_id}")
+        if isinstance(points, bool) or not isinstance(points, int) or not 0 <= points <= MAX_POINTS_PER_SKILL:
+            raise ValueError(f"Points for {column} must be a whole number from 0 to {MAX_POINTS_PER_SKILL}")
+        skills[column] = points
+    total = sum(skills.values())
+    if max_total is not None and total != max_total:
+        raise ValueError(f"Total points must be exactly {max_total}. Current total: {total}")
+    return skills
+
+def submit_response(submitter_email, submitter_name):
+    """Save the allocation in session state as a new response and switch to the report"""
+    # Prepare new response
+    response_data = {
+        'Response ID': str(uuid.uuid4())[:8],
+        'Submitter Name': submitter_name,
+        'Timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'Submitter Email': submitter_email,
+        **st.session_state.skills
+    }
+    
+    # Save the response through the shared append-only path
+    if save_response(response_data):
+        # Set form_submitted to True and show success message
+        st.session_state.form_submitted = True
+        st.rerun()
+
+def show_allocation_grid(submitter_email, submitter_name, max_total, tracker):
+    """Skills allocation edited in the browser; the server only sees paused-edit drafts and the submission"""
+    # The sidebar tracker lags the grid, so say so while the grid is on screen
+    show_points_tracker(tracker, grid_hint=True)
+    result = skills_allocation(
+        skills=[[skill_id, skill] for skill_id, skill in SKILL_NAMES.items()],
+        allocation={skill_id: st.session_state.skills.get(skill, 0) for skill_id, skill in SKILL_NAMES.items()
+                    if st.session_state.skills.get(skill, 0)},
+        max_total=max_total,
+        max_per_skill=MAX_POINTS_PER_SKILL,
+        tier_by_points=list(TIER_BY_POINTS),
+        tier_labels=list(TIER_LABELS),
+        height=640,
+        draft_delay_ms=GRID_DRAFT_DELAY_MS,
+        key='allocation_grid',
+        default=None,
+    )
+    
+    # The component keeps returning its last value; act once per value
+    if not result or result.get('nonce') == st.session_state.get('allocation_nonce'):
+        return
+    st.session_state.allocation_nonce = result['nonce']
+    
+    # Limits are enforced in the browser but checked again here
+    submitted = bool(result.get('submitted'))
+    try:
+        skills = allocation_from_component(result.get('allocation'), max_total if submitted else None)
+    except (TypeError, ValueError) as e:
+        if submitted:
+            st.error(str(e))
+        return
+    
+    # Drafts are kept so a remounted grid (e.g. after visiting Admin) starts from them
+    st.session_state.skills = skills
+    recount_total_points()
+    show_points_tracker(tracker, grid_hint=True)
+    if submitted:
+        submit_response(submitter_email, submitter_name)
+
+def show_points_tracker(tracker, grid_hint=False):
+    """Render the sidebar points tracker into its placeholder"""
+    with tracker.container():
+        st.markdown("### Points Tracker")
+        progress = min(st.session_state.total_points / 120, 1.0)
+        st.progress(progress)
+        st.metric("Total Points Used", st.session_state.total_points, f"/120 available")
+        if grid_hint:
+            st.caption("Updated when you pause typing; the grid shows your live total.")
+
+def show_skills_form(submitter_email, submitter_name, tracker):
     """Display the skills matrix form"""
     # Constants
     MAX_TOTAL_POINTS = 120
@@ -875,6 +995,10 @@ def show_skills_form(submitter_email, submitter_name):
             st.stop()
         return
 
+    if FORM_WIDGET == "grid":
+        show_allocation_grid(submitter_email, submitter_name, MAX_TOTAL_POINTS, tracker)
+        return
+
     st.markdown("<u>**You can type a number directly or use the up/down arrows to enter your points.**</u>", unsafe_allow_html=True)
     st.markdown("<u>**Enter numbers slowly to allow the software time to register.**</u>", unsafe_allow_html=True)
 
@@ -883,83 +1007,39 @@ def show_skills_form(submitter_email, submitter_name):
     
     st.markdown("---")
     
-    # Create input fields for each skill
-    skill_inputs = {}
-    for skill in st.session_state.skills.keys():
-        col1, col2, col3 = st.columns([3, 1, 1])
-        
-        with col1:
-            st.markdown(f"**{skill}**")
-        
-        # Calculate maximum points available for this skill
-        current_skill_points = st.session_state.get(f"input_{skill}", 0)
-        remaining_points = MAX_TOTAL_POINTS - (st.session_state.total_points - current_skill_points)
-        points_available = min(MAX_POINTS_PER_SKILL, remaining_points)
-        
-        with col2:
-            try:
-                value = st.number_input(
-                    f"{skill} points",
-                    min_value=0,
-                    max_value=points_available,
-                    value=current_skill_points,
-                    key=f"input_{skill}",
-                    on_change=update_total_points,
-                    help="You've used all 120 points. To add points here, first reduce points in other skills." if st.session_state.total_points >= MAX_TOTAL_POINTS and current_skill_points == 0 else None
-                )
-                st.session_state.skills[skill] = value
-                skill_inputs[skill] = value
-            except:
-                if st.session_state.total_points >= MAX_TOTAL_POINTS:
-                    st.error("You've used all 120 points. To add points here, first reduce points in other skills.")
-        
-        with col3:
-            st.markdown(get_expertise_level(value))
+    # Only searched-for skills and expanded sections are rendered as widgets
+    query = st.text_input("Search skills:", key='skill_search', placeholder="e.g. licensing, privacy, M&A")
+    if query.strip():
+        matches = search_skills(query)
+        if not matches:
+            st.info("No skills match your search.")
+        for skill_id in matches:
+            show_skill_input(skill_id, MAX_TOTAL_POINTS)
+    else:
+        for area, skill_ids in PRACTICE_AREAS.items():
+            allocated = sum(st.session_state.skills.get(SKILL_NAMES[skill_id], 0) for skill_id in skill_ids)
+            label = f"**{area}** ({len(skill_ids)} skills, {allocated:g} points)"
+            if st.toggle(label, key=f"section_{area}"):
+                for skill_id in skill_ids:
+                    show_skill_input(skill_id, MAX_TOTAL_POINTS)
     
     # Submit form
     with st.form("skills_matrix"):
         submitted = st.form_submit_button("Submit Skills Matrix")
         
         if submitted:
-            # Validate total points before submission
-            if abs(st.session_state.total_points - MAX_TOTAL_POINTS) > 0.1:
+            # Validate total points before submission against a full recount of the allocation
+            if abs(recount_total_points() - MAX_TOTAL_POINTS) > 0.1:
                 st.error(f"Total points must be exactly {MAX_TOTAL_POINTS}. Current total: {st.session_state.total_points}")
                 return
                 
-            # Read existing responses
-            try:
-                existing_responses = pd.read_csv("skills_responses.csv")
-            except Exception as e:
-                st.error(f"Error reading existing responses: {e}")
-                return
-
-            # Prepare new response
-            response_data = {
-                'Response ID': str(uuid.uuid4())[:8],
-                'Submitter Name': submitter_name,
-                'Timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'Submitter Email': submitter_email,
-                **st.session_state.skills
-            }
-            
-            # Create new response DataFrame
-            new_response = pd.DataFrame([response_data])
-            
-            # Combine existing and new responses
-            updated_responses = pd.concat([existing_responses, new_response], ignore_index=True)
-            
-            try:
-                # Save updated responses
-                updated_responses.to_csv("skills_responses.csv", index=False)
-                
-                # Set form_submitted to True and show success message
-                st.session_state.form_submitted = True
-                st.rerun()
-            except Exception as e:
-                st.error(f"Error saving response: {e}")
-                return
+            submit_response(submitter_email, submitter_name)
 
 def main():
+    # Bring stored responses and the submission log up to their current formats
+    ensure_schema()
+    migrate_legacy_log()
+    
     # Initialize total_points in session state if it doesn't exist
     if 'total_points' not in st.session_state:
         st.session_state.total_points = 0
@@ -969,12 +1049,10 @@ def main():
         st.title("Navigation")
         page = st.radio("Go to", ["Caravel Skills Matrix", "Admin"])
         
-        # Always show points tracker in sidebar
+        # Always show points tracker in sidebar; the grid refreshes it when a draft arrives
         st.markdown("---")
-        st.markdown("### Points Tracker")
-        progress = min(st.session_state.total_points / 120, 1.0)
-        st.progress(progress)
-        st.metric("Total Points Used", st.session_state.total_points, f"/120 available")
+        tracker = st.empty()
+        show_points_tracker(tracker)
         
         # Add color-coded expertise level legend
         st.markdown("---")
@@ -982,8 +1060,9 @@ def main():
         st.markdown("🔵 Primary (8-10 points)")
         st.markdown("🟢 Secondary (3-7 points)")
         st.markdown("🟡 Limited (1-2 points)")
-        st.markdown("---")
-        st.markdown("Enter numbers slowly to allow the software time to register.")
+        if FORM_WIDGET != "grid":
+            st.markdown("---")
+            st.markdown("Enter numbers slowly to allow the software time to register.")
     
     if page == "Admin":
         if not check_password():
@@ -1059,178 +1138,9 @@ def main():
         if 'total_points' not in st.session_state:
             st.session_state.total_points = 0
         if 'skills' not in st.session_state:
-            st.session_state.skills = {
-                'Acquisitions (Skill 1)': 0,
-                'Advertising and Labeling Regulations (Pharma/BioTech) (Skill 2)': 0,
-                'Advertising and Marketing Regulations (Retail and Consumer) (Skill 3)': 0,
-                'Advertising Technology (AdTech) (Skill 4)': 0,
-                'Affiliate Marketing Agreements (Skill 5)': 0,
-                'Amalgamations (Skill 6)': 0,
-                'Artificial Intelligence Terms, Regulations & Compliance (Skill 7)': 0,
-                'Associations (Skill 8)': 0,   
-                'Banking and Finance Transactions (Skill 9)': 0,
-                'Banking Regulation and Compliance (Skill 10)': 0,
-                'Bankrupcty and Insolvency (Debtor/Creditor) (Skill 11)': 0,
-                'Biotech Agreements (Skill 12)': 0,
-                'Blockchain Governance (Skill 13)': 0,
-                'Board of Directors and Committees (Skill 14)': 0,
-                'Canadian Anti-Spam Legislation (CASL) (Skill 15)': 0,
-                'Children\'s Privacy (Skill 16)': 0,
-                'Clinical Trials and Research (Skill 17)': 0,
-                'Collections (Skill 18)': 0,
-                'Commercial Contracts (Skill 19)': 0,
-                'Commercial Real Estate Transactions (Skill 20)': 0,
-                'Competition (Skill 21)': 0,
-                'Construction (Skill 22)': 0,
-                'Consumer Banking Regulations (Skill 23)': 0,
-                'Consumer Protection (B2C) (Skill 24)': 0,
-                'Content Creation and Copyright (Skill 25)': 0,
-                'Content Removal and Takedown (Skill 26)': 0,
-                'Continuous Disclosure (Skill 27)': 0,  
-                'Copyright and Fair Dealing (Skill 28)': 0,
-                'Corporate Bylaws, Records and Governance (Skill 29)': 0,
-                'Corporate Reorganization (Skill 30)': 0,
-                'Corruption and Anti-Bribery (Skill 31)': 0,
-                'Cross-Border Privacy Compliance (Skill 32)': 0,
-                'Cross-Border Transactions (Skill 33)': 0,
-                'Cryptocurrency Exchange (Digital Assets & Blockchain) (Skill 34)': 0,
-                'Customs Regulations (Skill 35)': 0,
-                'Cybersecurity and Data Protection (Regulatory Compliance) (Skill 36)': 0,
-                'Cybersecurity/Data Breach Incident Response (Skill 37)': 0,
-                'Data Collection, Sales and Compliance (Data Brokers) (Skill 38)': 0,
-                'Debt & Equity Financing (Skill 39)': 0,
-                'Deferred Compensation Plans (Skill 40)': 0,
-                'Demand Response Agreements (Skill 41)': 0,
-                'Derivatives and Commodities (Skill 42)': 0,
-                'Digital Advertising Regulation (Skill 43)': 0,
-                'Digital Media and Online Content (Skill 44)': 0,
-                'Digital Payment Regulations (Skill 45)': 0,
-                'Dissolutions (Skill 46)': 0,
-                'Distribution and Supply Agreements (Skill 47)': 0,
-                'Drones (Skill 48)': 0,
-                'Drug, Alcohol, Gaming Regulatory (Skill 49)': 0,
-                'Due Diligence and Valuation (Skill 50)': 0,
-                'eCommerce (Skill 51)': 0,
-                'Employee Benefits Plans (Skill 52)': 0,
-                'Employee side Employment Issues (Skill 53)': 0,
-                'Employee Stock Purchase Plans (Skill 54)': 0,
-                'Employee Training Programs (Skill 55)': 0,
-                'Employer Side Employment Issues (Skill 56)': 0,
-                'Employment Agreements (Skill 57)': 0,
-                'Employment; Notice, Severance and Termination (Skill 58)': 0,
-                'Employment; Workplace Discrimination and Human Rights (Skill 59)': 0,
-                'Employment-based Immigration (Skill 60)': 0,
-                'Energy Contracts and Agreements (Skill 61)': 0,
-                'Energy - Hydro (Skill 62)': 0,
-                'Energy - Nuclear (Skill 63)': 0,
-                'Energy - Solar (Skill 64)': 0,
-                'Energy - Wind (Skill 65)': 0,
-                'Entertainment and Sponsorship Agreements (Skill 66)': 0,
-                'Environmental Sustainability Compliance (Skill 67)': 0,
-                'Equity Compensation or Incentive Plans (Skill 68)': 0,
-                'Escrow Agreements (Skill 69)': 0,
-                'Executive Compensation (Skill 70)': 0,
-                'Export Control Regulations (Skill 71)': 0,
-                'Federal and Provincial Government Contracting (Prime and Subs) (Skill 72)': 0,
-                'Financial Services Regulatory Requirements (Skill 73)': 0,
-                'Financial Transactions and Structuring (Skill 74)': 0,
-                'Fintech (Skill 75)': 0,
-                'Fintrac (Skill 76)': 0,
-                'Forced Labour and Slavery (Skill 77)': 0,
-                'Formation and Entity Creation/Operating Agreements (Skill 78)': 0,
-                'Founder Agreements (Skill 79)': 0,
-                'Franchise Law - Franchisee (Skill 80)': 0,
-                'Franchise Law - Franchisor (Skill 81)': 0,
-                'Global/Cross-Border Employment Issues (Skill 82)': 0,
-                'Health Canada Compliance, Regulations and Enforcement (Skill 83)': 0,
-                'Healthcare Compliance and Regulations (Skill 84)': 0,
-                'Higher Education Regulations (Skill 85)': 0,
-                'Immigration - Business (Skill 86)': 0,
-                'Immigration - Personal/Family (Skill 87)': 0,
-                'Incorporations (Federal) (Skill 88)': 0,
-                'Incorporations (Professional) (Skill 89)': 0,
-                'Incorporations (Provincial) (Skill 90)': 0,
-                'Independent Contractor Agreements (Skill 91)': 0,
-                'Independent Schools (Skill 92)': 0,
-                'Indigenous Rights and Relations (Skill 93)': 0,
-                'Influencer Agreements (Skill 94)': 0,
-                'Initial Public Offering (IPO) (Skill 95)': 0,
-                'Insurance Coverage Review (Skill 96)': 0,
-                'Intellectual Property in M&A (Skill 97)': 0,
-                'Intellectual Property Infringement (Skill 98)': 0,
-                'Intellectual Property Licensing (Skill 99)': 0,
-                'Intellectual Property Protection (Skill 100)': 0,
-                'International Data Transfers (Skill 101)': 0,
-                'International Trade and Import Export (Skill 102)': 0,
-                'International/Foreign Government Contracts (Skill 103)': 0,
-                'Investment and Funding (Skill 104)': 0,
-                'Investment Law and Regulations (Skill 105)': 0,
-                'Investor Relations and Reporting (Skill 106)': 0,
-                'Joint Ventures and Strategic Alliances (Skill 107)': 0,
-                'Labour and Union (Skill 108)': 0,
-                'Land Use and Zoning (Skill 109)': 0,
-                'Leasing (Commercial Property) (Skill 110)': 0,
-                'Leasing (Equipment) (Skill 111)': 0,
-                'Lending (secured or unsecured) (Skill 112)': 0,
-                'Life Sciences Licensing and Tech Transfer Agreements (Skill 113)': 0,
-                'Litigation (Civil) (Skill 114)': 0,
-                'Litigation (Employment) (Skill 115)': 0,
-                'Litigation (Small Claims) (Skill 116)': 0,
-                'Litigation Management (Skill 117)': 0,
-                'Lobbying and PACs (Skill 118)': 0,
-                'Loyalty Card Programs (Skill 119)': 0,
-                'M&A (Skill 120)': 0,
-                'Master Services Agreements (Skill 121)': 0,
-                'Media Production Contracts (Skill 122)': 0,
-                'Mediation (Skill 123)': 0,
-                'Medical Device Licensing and Distribution (Skill 124)': 0,
-                'Medical Device Regulations (Skill 125)': 0,
-                'Mining (Skill 126)': 0,
-                'Money Laundering and AML Regulations (Skill 127)': 0,
-                'Municipality (Skill 128)': 0,
-                'Natural Resource Management (Skill 129)': 0,
-                'Non-Competition and Solicitation Agreements (Skill 130)': 0,
-                'Non-Disclosure Agreements (Skill 131)': 0,
-                'Non-Profit Law (Skill 132)': 0,
-                'Occupational Health and Safety (Skill 133)': 0,
-                'Oil and Gas Regulation (Skill 134)': 0,
-                'Open Source Agreements (Skill 135)': 0,
-                'Patent Portfolio Management (Skill 136)': 0,
-                'Patent Prosecution (Skill 137)': 0,
-                'Payment Systems and Digital Payments (Skill 138)': 0,
-                'Pension Fund Management (Skill 139)': 0,
-                'Pharmaceutical Licensing (Skill 140)': 0,
-                'Policy Creation (Skill 141)': 0,
-                'Power Purchase Agreements (Skill 142)': 0,
-                'Privacy Compliance (Skill 143)': 0,
-                'Private Company Corporate Governance (Skill 144)': 0,
-                'Private Equity and Venture Capital (Skill 145)': 0,
-                'Private Public Partnerships (P3) (Skill 146)': 0,
-                'Procurement (private) & RFPs (Skill 147)': 0,
-                'Procurement (public) & RFPs (Skill 148)': 0,
-                'Product Labeling and Packaging (Skill 149)': 0,
-                'Product Warranties/Agreement Warranties (Skill 150)': 0,
-                'Professional Services Agreements and related SOWs (Skill 151)': 0,
-                'Prospectus (Skill 152)': 0,
-                'Public Company Corporate Governance (Skill 153)': 0,
-                'Purchase and Sale Agreements (Skill 154)': 0,
-                'Reorganizations (Skill 155)': 0,
-                'Sanctions Law & Compliance (Skill 156)': 0,
-                'Securities and Capital Markets (Skill 157)': 0,
-                'Shareholder and Partnership Agreements (Skill 158)': 0,
-                'Sports Law Agreements (Skill 159)': 0,
-                'State/Local SLED Government Contracting (Skill 160)': 0,
-                'Structured Finance and Securitization (Skill 161)': 0,
-                'Sweepstakes and Contests (Skill 162)': 0,
-                'Technology Licensing—Hardware (Skill 163)': 0,
-                'Technology Licensing—Software/SaaS (Skill 164)': 0,
-                'Terms of Service and User Agreements (Skill 165)': 0,
-                'Trademark and Brand Protection/Prosecution (Skill 166)': 0,
-                'Trademark Law/Portfolio Management (Skill 167)': 0,
-                'Waste Management and Recycling (Skill 168)': 0
-            }
+            st.session_state.skills = {column: 0 for column in SKILL_COLUMNS}
         
-        show_skills_form(submitter_email,submitter_name)
+        show_skills_form(submitter_email, submitter_name, tracker)
 
 if __name__ == "__main__":
     main()
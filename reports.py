@@ -0,0 +1,211 @@
+"""Skills matrix PDF reports, built one at a time or in parallel batches
+
+Usage:
+    python reports.py --out reports.zip [--search TEXT] [--since YYYY-MM-DD] [--until YYYY-MM-DD]
+                      [--processes N] [--backend log|sqlite|columnar|csv]
+"""
+import os
+import time
+import zipfile
+import argparse
+import multiprocessing
+from io import BytesIO
+from datetime import date, datetime
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from analytics import leave_one_out_averages
+from catalogue import METADATA_COLUMNS, display_name, tier_of
+from storage import ResponseCache
+
+# Built PDF reports, keyed by Response ID and tagged with the data version they were built at.
+# Module-level so it is shared by every session in the process; the app script itself is
+# re-executed on every Streamlit rerun.
+report_cache = ResponseCache(max_entries=256, max_bytes=64 * 1024 * 1024)
+
+def build_pdf_report(submitter_name, user_response, skill_cols, team_averages):
+    """Build the PDF skills report for one response and return its bytes
+
+    user_response and team_averages map each skill column to the respondent's points
+    and to the team's average points.
+    """
+    # Create a BytesIO buffer to receive PDF data
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
+    
+    # Container for the 'Flowable' objects
+    elements = []
+    styles = getSampleStyleSheet()
+    
+    # Title
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30
+    )
+    elements.append(Paragraph(f"Skills Matrix Report", title_style))
+    elements.append(Paragraph(f"Generated for: {submitter_name}", styles['Heading2']))
+    elements.append(Paragraph(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+    elements.append(Spacer(1, 20))
+    
+    # Categorize skills
+    expertise_categories = {
+        'Primary Expertise (8-10 points)': [],
+        'Secondary Expertise (3-7 points)': [],
+        'Limited Experience (1-2 points)': []
+    }
+    
+    tier_categories = {
+        3: 'Primary Expertise (8-10 points)',
+        2: 'Secondary Expertise (3-7 points)',
+        1: 'Limited Experience (1-2 points)'
+    }
+    
+    for skill in skill_cols:
+        value = user_response[skill]
+        tier = tier_of(value)
+        if tier:
+            expertise_categories[tier_categories[tier]].append(
+                (display_name(skill), value, team_averages[skill])
+            )
+    
+    # Add each category to the PDF
+    for category, skills in expertise_categories.items():
+        if skills:
+            # Add category header
+            elements.append(Spacer(1, 20))
+            elements.append(Paragraph(category, styles['Heading2']))
+            elements.append(Spacer(1, 10))
+            
+            # Create table data
+            table_data = [['Skill', 'Your Score', 'Team Average']]
+            for skill_name, value, team_avg in sorted(skills, key=lambda x: x[1], reverse=True):
+                table_data.append([
+                    skill_name,
+                    f"{value:.1f}",
+                    f"{team_avg:.1f}"
+                ])
+            
+            # Create and style the table
+            table = Table(table_data, colWidths=[4*inch, 1*inch, 1.5*inch])
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 14),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 1), (-1, -1), 12),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+                ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+                ('TOPPADDING', (0, 0), (-1, -1), 3),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+            ]))
+            elements.append(table)
+            elements.append(Spacer(1, 10))
+    
+    # Build PDF
+    doc.build(elements)
+    return buffer.getvalue()
+
+def report_file_name(submitter_name, response_id):
+    """File name of a respondent's report inside a batch archive"""
+    return f"skills_matrix_report_{str(submitter_name).replace(' ', '_')}_{str(response_id)[:8]}.pdf"
+
+# Batch generation
+#
+# Team averages are computed once for the whole batch: per-skill totals over all
+# responses minus each respondent's own rows give their leave-one-out averages in
+# O(skills), so every worker task carries just one response and one average vector.
+
+def _build_report_task(task):
+    submitter_name, response_id, user_values, skill_cols, team_averages = task
+    user_response = dict(zip(skill_cols, user_values))
+    team_averages = dict(zip(skill_cols, team_averages))
+    pdf = build_pdf_report(submitter_name, user_response, skill_cols, team_averages)
+    return report_file_name(submitter_name, response_id), pdf
+
+def report_tasks(df, respondents=None):
+    """One task per respondent (their latest response), optionally limited to the emails in respondents"""
+    skill_cols = [col for col in df.columns if col not in METADATA_COLUMNS]
+    values = df[skill_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    answered = ~np.isnan(values)
+    
+    # Each respondent's own sums and counts of answered cells, gathered in one pass;
+    # the team totals are their column sums
+    # Responses without an email share one group instead of getting the -1 NA code
+    codes, unique_emails = pd.factorize(df['Submitter Email'].fillna(''))
+    own_sums = np.zeros((len(unique_emails), len(skill_cols)))
+    own_counts = np.zeros((len(unique_emails), len(skill_cols)))
+    np.add.at(own_sums, codes, np.where(answered, values, 0.0))
+    np.add.at(own_counts, codes, answered)
+    total_sums, total_counts = own_sums.sum(axis=0), own_counts.sum(axis=0)
+    
+    latest = pd.Series(np.arange(len(df))).groupby(codes).last()
+    tasks = []
+    for code, row in latest.items():
+        if respondents is not None and unique_emails[code] not in respondents:
+            continue
+        averages = leave_one_out_averages(total_sums, total_counts, own_sums[code], own_counts[code])
+        tasks.append((df['Submitter Name'].iat[row], df['Response ID'].iat[row],
+                      values[row].tolist(), skill_cols, averages.tolist()))
+    return tasks
+
+def build_reports(df, out, respondents=None, processes=None, chunksize=None):
+    """Build a report per respondent across a process pool and write them into a zip archive
+
+    out is a path or a writable binary file. Returns (number of reports, elapsed seconds).
+    """
+    started = time.perf_counter()
+    tasks = report_tasks(df, respondents)
+    processes = processes or os.cpu_count() or 1
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+        if processes == 1 or len(tasks) <= 1:
+            for name, pdf in map(_build_report_task, tasks):
+                archive.writestr(name, pdf)
+        else:
+            # Spawned workers do not inherit the server's threads or open files
+            context = multiprocessing.get_context('spawn')
+            chunksize = chunksize or max(1, len(tasks) // (processes * 4))
+            with ProcessPoolExecutor(max_workers=min(processes, len(tasks)), mp_context=context) as pool:
+                for name, pdf in pool.map(_build_report_task, tasks, chunksize=chunksize):
+                    archive.writestr(name, pdf)
+    return len(tasks), time.perf_counter() - started
+
+def main():
+    from storage import get_repository, load_cached
+    from analytics import filter_responses
+    
+    parser = argparse.ArgumentParser(description="Build PDF skills reports for every respondent into a zip archive")
+    parser.add_argument('--out', default="skills_reports.zip")
+    parser.add_argument('--search', default="", help="only respondents whose name or email contains this text")
+    parser.add_argument('--since', type=date.fromisoformat, help="only responses submitted on or after this date")
+    parser.add_argument('--until', type=date.fromisoformat, help="only responses submitted on or before this date")
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--backend', default=os.environ.get("SKILLS_STORAGE_BACKEND", "log"))
+    args = parser.parse_args()
+    
+    repository = get_repository(args.backend, "skills_responses.csv", log_path="skills_responses.log",
+                                db_path="skills_responses.db", columnar_prefix="skills_responses")
+    df = load_cached(repository)
+    rows = filter_responses(df, args.search, args.since, args.until)
+    respondents = set(df['Submitter Email'].iloc[rows])
+    
+    count, elapsed = build_reports(df, args.out, respondents, args.processes)
+    print(f"{count} reports written to {args.out} in {elapsed:.2f}s "
+          f"({count / elapsed if elapsed else 0:.1f} reports/s)")
+
+if __name__ == "__main__":
+    main()
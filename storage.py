@@ -0,0 +1,999 @@
+import os
+import io
+import csv
+import gzip
+import json
+import zlib
+import sqlite3
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from catalogue import METADATA_COLUMNS, SKILL_NAMES
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Cross-process file lock
+
+class FileLock:
+    """Re-entrant lock shared by threads in this process and by every process on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def _lock_file(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        except Exception:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def _unlock_file(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            # Only the outermost acquisition takes the OS lock
+            if self._depth == 0:
+                self._lock_file()
+            self._depth += 1
+        except Exception:
+            self._thread_lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self._depth -= 1
+            if self._depth == 0:
+                self._unlock_file()
+        finally:
+            self._thread_lock.release()
+
+# Atomic file replacement
+
+def _fsync_directory(path):
+    """Flush a directory entry so a rename survives a crash"""
+    if os.name == 'nt':
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def snapshot_file(path, backup_path):
+    """Keep the current contents of path as backup_path, as a hardlink when possible"""
+    if not os.path.exists(path):
+        return
+    tmp_backup = f"{backup_path}.tmp"
+    if os.path.exists(tmp_backup):
+        os.remove(tmp_backup)
+    try:
+        os.link(path, tmp_backup)
+    except OSError:
+        # Filesystems without hardlinks fall back to a full copy
+        shutil.copy2(path, tmp_backup)
+    os.replace(tmp_backup, backup_path)
+
+def atomic_write(path, write, backup_path=None, mode='w'):
+    """Call write(f) on a temp file, fsync it and rename it over path"""
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.",
+                                    dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, mode, **({'newline': ''} if 'b' not in mode else {})) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        if backup_path:
+            snapshot_file(path, backup_path)
+        # Readers see either the old file or the new one, never a missing or partial file
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(path)
+
+def append_line(path, data, sync=True):
+    """Append one newline-terminated line with a single write, returning the new file size"""
+    fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        # Terminate a line torn by a crash so it cannot swallow this one
+        size = os.fstat(fd).st_size
+        if size:
+            os.lseek(fd, size - 1, os.SEEK_SET)
+            if os.read(fd, 1) != b"\n":
+                data = b"\n" + data
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+        if sync:
+            os.fsync(fd)
+        return os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+
+def atomic_write_csv(df, path, backup_path=None):
+    """Atomically replace path with the CSV form of a DataFrame"""
+    atomic_write(path, lambda f: df.to_csv(f, index=False), backup_path)
+
+# Metadata is always text: left to inference, a Response ID such as "12345678" or
+# "12e45678" would parse as a number and no longer match its own row
+METADATA_DTYPES = {column: str for column in METADATA_COLUMNS}
+
+def read_responses_csv(path, **kwargs):
+    """Read a responses CSV (or a chunk of one) with the metadata columns as strings"""
+    return pd.read_csv(path, dtype=METADATA_DTYPES, **kwargs)
+
+# Append-only submission log
+#
+# Every change to the response set is a single framed line appended to the log:
+#   \n<payload length> <crc32 hex> <json payload>
+# Frames start with a newline so a torn write left behind by a crash is always
+# terminated by the next append, and the length/crc pair lets readers drop it.
+
+def _frame_record(record):
+    """Encode a record as one crash-safe log frame"""
+    payload = json.dumps(record, separators=(',', ':')).encode('ascii')
+    return b"\n%d %08x " % (len(payload), zlib.crc32(payload)) + payload
+
+def _parse_frame(line):
+    """Decode a single log line, returning None for blank, torn or corrupted frames"""
+    try:
+        length, checksum, payload = line.split(b" ", 2)
+        if int(length) != len(payload) or int(checksum, 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+def append_record(path, record):
+    """Append a single record to the log with one write and an fsync"""
+    data = _frame_record(record)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def read_records_from(path, offset=0):
+    """Read the intact records appended after offset and return them with the offset to resume from
+
+    The final line is only consumed once it validates, so a frame that is still being
+    written is picked up by the next read instead of being skipped.
+    """
+    if not os.path.exists(path):
+        return [], 0
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        content = f.read()
+    lines = content.split(b"\n")
+    records = []
+    position = offset
+    for i, line in enumerate(lines):
+        record = _parse_frame(line) if line else None
+        if record is not None:
+            records.append(record)
+        elif i == len(lines) - 1 and line:
+            break
+        position += len(line) + (1 if i < len(lines) - 1 else 0)
+    return records, position
+
+def apply_records(df, records):
+    """Apply add/delete/clear records to a response frame, batching consecutive adds"""
+    pending = []
+
+    def flush(df):
+        if not pending:
+            return df
+        new_rows = pd.DataFrame(pending)
+        pending.clear()
+        if len(df.columns) == 0:
+            return new_rows
+        # Keep the existing column order and add any new columns at the end
+        return pd.concat([df, new_rows], ignore_index=True)
+
+    for record in records:
+        op = record.get("op")
+        if op == "add":
+            pending.append(record["data"])
+        elif op == "delete":
+            df = flush(df)
+            if 'Response ID' in df.columns:
+                df = df[df['Response ID'] != record["id"]].reset_index(drop=True)
+        elif op == "clear":
+            pending.clear()
+            df = df.iloc[0:0]
+    return flush(df)
+
+class CsvTailReader:
+    """Keeps a parsed CSV frame up to date by parsing only the rows appended since the last read
+
+    Falls back to a full reload when the file was replaced, truncated or its header changed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._df = None
+        self._inode = None
+        self._offset = 0
+        self._header = b""
+
+    def _full_reload(self, stat):
+        with open(self.path, 'rb') as f:
+            content = f.read()
+        # Only parse complete lines; a row being appended right now is picked up next time
+        end = content.rfind(b"\n") + 1
+        if end == 0:
+            self._reset()
+            return pd.DataFrame()
+        self._df = read_responses_csv(io.BytesIO(content[:end]))
+        self._inode = stat.st_ino
+        self._offset = end
+        self._header = content[:content.find(b"\n") + 1]
+        return self._df
+
+    def _header_unchanged(self, f):
+        return f.read(len(self._header)) == self._header
+
+    def read(self):
+        """Return the parsed frame; callers must not modify it in place"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._reset()
+                return pd.DataFrame()
+            if self._df is None or stat.st_ino != self._inode or stat.st_size < self._offset:
+                return self._full_reload(stat)
+            if stat.st_size == self._offset:
+                return self._df
+            with open(self.path, 'rb') as f:
+                if not self._header_unchanged(f):
+                    return self._full_reload(stat)
+                f.seek(self._offset)
+                chunk = f.read()
+            end = chunk.rfind(b"\n") + 1
+            if end == 0:
+                return self._df
+            try:
+                new_rows = read_responses_csv(io.BytesIO(chunk[:end]), header=None,
+                                              names=list(self._df.columns))
+            except Exception:
+                return self._full_reload(stat)
+            self._df = pd.concat([self._df, new_rows], ignore_index=True)
+            self._offset += end
+            return self._df
+
+# Bounded JSON Lines log
+#
+# Entries are appended one per line; once the file grows past its compaction size it is
+# atomically rewritten with only the newest entries, so appends stay O(entry) amortized.
+
+def append_json_line(path, entry, keep=100, compact_bytes=256 * 1024):
+    """Append one JSON entry and compact the file to the last `keep` entries when it gets large"""
+    # The log is informational, so appends skip the fsync
+    size = append_line(path, (json.dumps(entry) + "\n").encode('utf-8'), sync=False)
+    if size > compact_bytes:
+        entries = read_last_json_lines(path, keep)
+        atomic_write(path, lambda f: f.writelines(json.dumps(e) + "\n" for e in entries))
+
+def read_last_json_lines(path, limit, block_size=8192):
+    """Read the last `limit` entries by scanning backwards from the end of the file"""
+    if limit <= 0 or not os.path.exists(path):
+        return []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        wanted = limit
+        while True:
+            # One extra newline is needed so the first kept line is complete
+            while position > 0 and data.count(b"\n") <= wanted:
+                step = min(block_size, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+            lines = data.split(b"\n")
+            if position > 0:
+                lines = lines[1:]
+            entries = []
+            for line in lines:
+                if line.strip():
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        # Skip a line torn by a crash
+                        continue
+            if len(entries) >= limit or position == 0:
+                return entries[-limit:]
+            # Torn or blank lines used up part of the budget; read further back
+            wanted += limit - len(entries)
+
+def _file_version(*paths):
+    """Identify the current state of files by inode, size and modification time"""
+    version = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            version.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            version.append(None)
+    return tuple(version)
+
+def _read_schema_version(path):
+    """Schema version recorded in a sidecar file; data without one predates versioning"""
+    try:
+        with open(path) as f:
+            return json.load(f).get('schema_version', 1)
+    except (OSError, ValueError):
+        return 1
+
+def _write_schema_version(path, version):
+    atomic_write(path, lambda f: json.dump({'schema_version': version}, f))
+
+# Response repositories
+#
+# All backends expose the same small interface used by the app:
+#   load() -> DataFrame, add(response_data), find_by_email(email) -> DataFrame,
+#   delete(response_id) -> bool, clear(), version() -> hashable data version,
+#   migrate_schema(version, migrate) -> bool
+
+
+class CsvRepository:
+    """Legacy CSV backend: appends rows that fit the header and atomically rewrites otherwise"""
+
+    def __init__(self, csv_path):
+        self.csv_path = csv_path
+        self.backup_path = f"{csv_path}.backup"
+        self.schema_path = f"{csv_path}.schema.json"
+        self._schema_version = None
+        self._tail = CsvTailReader(csv_path)
+
+    def load(self):
+        return self._tail.read()
+
+    def _read_header(self):
+        if not os.path.exists(self.csv_path):
+            return None
+        with open(self.csv_path, newline='') as f:
+            return next(csv.reader(f), None)
+
+    def _append_row(self, response_data, header):
+        """Append one row in the existing column order with a single write and an fsync"""
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerow(
+            ['' if response_data.get(col) is None else response_data[col] for col in header]
+        )
+        append_line(self.csv_path, buffer.getvalue().encode('utf-8'))
+
+    def add(self, response_data):
+        # Rows that fit the existing header are appended, new columns force a rewrite
+        header = self._read_header()
+        if header and set(response_data) <= set(header):
+            self._append_row(response_data, header)
+            return
+        responses_df = self.load()
+        new_response = pd.DataFrame([response_data])
+        if responses_df.empty:
+            responses_df = pd.DataFrame(columns=new_response.columns)
+        all_columns = responses_df.columns.union(new_response.columns)
+        updated = pd.concat([responses_df.reindex(columns=all_columns),
+                             new_response.reindex(columns=all_columns)], ignore_index=True)
+        atomic_write_csv(updated, self.csv_path, self.backup_path)
+
+    def find_by_email(self, email):
+        df = self.load()
+        if df.empty:
+            return df
+        return df[df['Submitter Email'] == email]
+
+    def delete(self, response_id):
+        df = self.load()
+        if df.empty:
+            return False
+        updated = df[df['Response ID'] != response_id]
+        atomic_write_csv(updated, self.csv_path, self.backup_path)
+        return len(updated) < len(df)
+
+    def clear(self):
+        atomic_write_csv(pd.DataFrame(columns=METADATA_COLUMNS), self.csv_path, self.backup_path)
+
+    def version(self):
+        return _file_version(self.csv_path)
+
+    def migrate_schema(self, version, migrate):
+        """Rewrite the CSV with migrate() once if it predates the given schema version"""
+        if self._schema_version is None:
+            self._schema_version = _read_schema_version(self.schema_path)
+        if self._schema_version >= version:
+            return False
+        if os.path.exists(self.csv_path):
+            atomic_write_csv(migrate(read_responses_csv(self.csv_path)), self.csv_path, self.backup_path)
+        _write_schema_version(self.schema_path, version)
+        self._schema_version = version
+        return True
+
+class LogRepository:
+    """Append-only log backend layered on top of the legacy CSV"""
+
+    def __init__(self, csv_path, log_path):
+        self.csv_path = csv_path
+        self.log_path = log_path
+        self.schema_path = f"{csv_path}.schema.json"
+        self._schema_version = None
+        self._lock = threading.Lock()
+        self._df = None
+        self._base_version = None
+        self._log_inode = None
+        self._offset = 0
+
+    def load(self):
+        """Replay only the log records appended since the last load"""
+        with self._lock:
+            base_version = _file_version(self.csv_path)
+            try:
+                log_stat = os.stat(self.log_path)
+                log_inode, log_size = log_stat.st_ino, log_stat.st_size
+            except FileNotFoundError:
+                log_inode, log_size = None, 0
+            if (self._df is None or base_version != self._base_version
+                    or log_inode != self._log_inode or log_size < self._offset):
+                self._df = read_responses_csv(self.csv_path) if os.path.exists(self.csv_path) else pd.DataFrame()
+                self._base_version = base_version
+                self._log_inode = log_inode
+                self._offset = 0
+            if log_size > self._offset:
+                records, self._offset = read_records_from(self.log_path, self._offset)
+                self._df = apply_records(self._df, records)
+            return self._df
+
+    def add(self, response_data):
+        append_record(self.log_path, {"op": "add", "data": response_data})
+
+    def find_by_email(self, email):
+        df = self.load()
+        if df.empty:
+            return df
+        return df[df['Submitter Email'] == email]
+
+    def delete(self, response_id):
+        # The loaded frame is kept up to date incrementally, so the lookup is cheap
+        df = self.load()
+        if df.empty or not (df['Response ID'] == str(response_id)).any():
+            return False
+        append_record(self.log_path, {"op": "delete", "id": response_id})
+        return True
+
+    def clear(self):
+        append_record(self.log_path, {"op": "clear"})
+
+    def version(self):
+        return _file_version(self.csv_path, self.log_path)
+
+    def migrate_schema(self, version, migrate):
+        """Rewrite the legacy CSV under the log with migrate() once if it predates the schema version"""
+        if self._schema_version is None:
+            self._schema_version = _read_schema_version(self.schema_path)
+        if self._schema_version >= version:
+            return False
+        if os.path.exists(self.csv_path):
+            atomic_write_csv(migrate(read_responses_csv(self.csv_path)), self.csv_path, f"{self.csv_path}.backup")
+        _write_schema_version(self.schema_path, version)
+        self._schema_version = version
+        return True
+
+# Sparse allocations
+#
+# A respondent only spends 120 points on a few dozen skills, so a response can be
+# stored as its metadata plus (Response ID, Skill, Points) triples for the non-zero
+# skills. The wide one-column-per-skill frame is rebuilt only when it is needed.
+
+def to_sparse(df):
+    """Split a wide response frame into (metadata, allocations, skill columns)"""
+    skill_cols = [col for col in df.columns if col not in METADATA_COLUMNS]
+    meta = df.reindex(columns=METADATA_COLUMNS).reset_index(drop=True)
+    if skill_cols:
+        values = df[skill_cols].apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy(dtype=float)
+    else:
+        values = np.zeros((len(df), 0))
+    rows, cols = np.nonzero(values)
+    allocations = pd.DataFrame({
+        'Response ID': meta['Response ID'].to_numpy()[rows],
+        'Skill': np.asarray(skill_cols, dtype=object)[cols],
+        'Points': values[rows, cols],
+    })
+    return meta, allocations, skill_cols
+
+def to_wide(meta, allocations, skill_cols, fill_value=0.0):
+    """Rebuild the wide response frame, with fill_value for every skill a response did not allocate"""
+    values = np.full((len(meta), len(skill_cols)), fill_value, dtype=float)
+    if len(allocations):
+        row_pos = pd.Index(meta['Response ID']).get_indexer(allocations['Response ID'])
+        col_pos = pd.Index(skill_cols).get_indexer(allocations['Skill'])
+        valid = (row_pos >= 0) & (col_pos >= 0)
+        values[row_pos[valid], col_pos[valid]] = allocations['Points'].to_numpy(dtype=float)[valid]
+    return pd.concat([meta.reset_index(drop=True), pd.DataFrame(values, columns=skill_cols)], axis=1)
+
+class SqliteRepository:
+    """Embedded SQLite backend storing sparse allocations, indexed on email, Response ID and Timestamp"""
+
+    SCHEMA_VERSION = 1
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS responses (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            response_id TEXT NOT NULL,
+            timestamp TEXT,
+            email TEXT,
+            name TEXT
+        )""",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_responses_response_id ON responses(response_id)",
+        "CREATE INDEX IF NOT EXISTS idx_responses_email ON responses(email)",
+        "CREATE INDEX IF NOT EXISTS idx_responses_timestamp ON responses(timestamp)",
+        """CREATE TABLE IF NOT EXISTS skills (
+            skill_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE
+        )""",
+        """CREATE TABLE IF NOT EXISTS allocations (
+            response_id TEXT NOT NULL,
+            skill_id INTEGER NOT NULL,
+            points REAL NOT NULL,
+            PRIMARY KEY (response_id, skill_id)
+        ) WITHOUT ROWID""",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)",
+    ]
+
+    def __init__(self, db_path, legacy_csv_path=None):
+        self.db_path = db_path
+        self.legacy_csv_path = legacy_csv_path
+        self._schema_version = None
+        with self._connect() as conn:
+            self._initialize(conn)
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _initialize(self, conn):
+        user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(responses)")]
+        legacy_rows = []
+        if user_version < 1 and 'skills' in columns:
+            # Version 0 kept every response's skills as one JSON blob; unpack it into allocations
+            for response_id, timestamp, email, name, skills in conn.execute(
+                    "SELECT response_id, timestamp, email, name, skills FROM responses ORDER BY seq"):
+                row = {'Response ID': response_id, 'Timestamp': timestamp,
+                       'Submitter Email': email, 'Submitter Name': name}
+                row.update(json.loads(skills))
+                legacy_rows.append(row)
+            conn.execute("DROP TABLE responses")
+        # Plain execute() keeps the migration in one transaction (executescript would commit early)
+        for statement in self.SCHEMA:
+            conn.execute(statement)
+        if conn.execute("SELECT COUNT(*) FROM skills").fetchone()[0] == 0:
+            # New databases key allocations by the catalogue's stable skill ids
+            conn.executemany("INSERT INTO skills (skill_id, name) VALUES (?, ?)",
+                             [(skill_id, name) for skill_id, name in SKILL_NAMES.items()])
+        for row in legacy_rows:
+            self._insert(conn, row, ignore_duplicates=True)
+        conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        imported = conn.execute("SELECT value FROM meta WHERE key = 'legacy_imported'").fetchone()
+        if imported is None:
+            # Import the legacy CSV once so existing history is not lost
+            if self.legacy_csv_path and os.path.exists(self.legacy_csv_path):
+                legacy_df = read_responses_csv(self.legacy_csv_path)
+                for row in legacy_df.to_dict('records'):
+                    self._insert(conn, row, ignore_duplicates=True)
+            conn.execute("INSERT INTO meta (key, value) VALUES ('legacy_imported', '1')")
+
+    def _skill_ids(self, conn, names):
+        """Map skill column names to integer ids, registering unseen skills"""
+        conn.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)", [(name,) for name in names])
+        placeholders = ",".join("?" * len(names))
+        return dict(conn.execute(f"SELECT name, skill_id FROM skills WHERE name IN ({placeholders})", names))
+
+    def _insert(self, conn, response_data, ignore_duplicates=False):
+        response_id = str(response_data.get('Response ID'))
+        verb = "INSERT OR IGNORE" if ignore_duplicates else "INSERT"
+        cursor = conn.execute(
+            f"{verb} INTO responses (response_id, timestamp, email, name) VALUES (?, ?, ?, ?)",
+            (response_id, response_data.get('Timestamp'),
+             response_data.get('Submitter Email'), response_data.get('Submitter Name'))
+        )
+        if cursor.rowcount == 0:
+            return
+        skills = [k for k in response_data if k not in METADATA_COLUMNS]
+        if not skills:
+            return
+        skill_ids = self._skill_ids(conn, skills)
+        # Only allocated points are stored; every other skill reads back as 0
+        conn.executemany(
+            "INSERT INTO allocations (response_id, skill_id, points) VALUES (?, ?, ?)",
+            [(response_id, skill_ids[k], float(v)) for k, v in response_data.items()
+             if k in skill_ids and isinstance(v, (int, float)) and not pd.isna(v) and v != 0]
+        )
+
+    def _query_sparse(self, conn, where="", params=()):
+        meta = pd.read_sql_query(
+            f"SELECT response_id AS \"Response ID\", timestamp AS \"Timestamp\", "
+            f"email AS \"Submitter Email\", name AS \"Submitter Name\" FROM responses {where} ORDER BY seq",
+            conn, params=params)
+        allocations = pd.read_sql_query(
+            f"SELECT a.response_id AS \"Response ID\", s.name AS \"Skill\", a.points AS \"Points\" "
+            f"FROM allocations a JOIN skills s ON s.skill_id = a.skill_id "
+            f"WHERE a.response_id IN (SELECT response_id FROM responses {where})",
+            conn, params=params)
+        skill_cols = [name for (name,) in conn.execute("SELECT name FROM skills ORDER BY skill_id")]
+        return meta, allocations, skill_cols
+
+    def load_sparse(self):
+        """Return (metadata, allocations, skill columns) without building the wide frame"""
+        with self._connect() as conn:
+            return self._query_sparse(conn)
+
+    def load(self):
+        return to_wide(*self.load_sparse())
+
+    def add(self, response_data):
+        with self._connect() as conn:
+            self._insert(conn, response_data)
+            self._bump_generation(conn)
+
+    def _bump_generation(self, conn):
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+
+    def find_by_email(self, email):
+        with self._connect() as conn:
+            return to_wide(*self._query_sparse(conn, "WHERE email = ?", (email,)))
+
+    def delete(self, response_id):
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM responses WHERE response_id = ?", (response_id,))
+            conn.execute("DELETE FROM allocations WHERE response_id = ?", (response_id,))
+            self._bump_generation(conn)
+        return cursor.rowcount > 0
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM allocations")
+            self._bump_generation(conn)
+
+    def version(self):
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return (self.db_path, row[0] if row else None)
+
+    def migrate_schema(self, version, migrate):
+        """Re-ingest every response through migrate() once if the data predates the schema version"""
+        if self._schema_version is None:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            self._schema_version = int(row[0]) if row else 1
+        if self._schema_version >= version:
+            return False
+        with self._connect() as conn:
+            # Unallocated cells stay NaN so migrate() can fall back to historical columns
+            migrated = migrate(to_wide(*self._query_sparse(conn), fill_value=np.nan))
+            conn.execute("DELETE FROM allocations")
+            conn.execute("DELETE FROM responses")
+            # Re-key skills by catalogue id; historical names are folded into catalogue columns
+            conn.execute("DELETE FROM skills")
+            conn.executemany("INSERT INTO skills (skill_id, name) VALUES (?, ?)",
+                             [(skill_id, name) for skill_id, name in SKILL_NAMES.items()])
+            for row in migrated.to_dict('records'):
+                self._insert(conn, row)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)", (version,))
+            self._bump_generation(conn)
+        self._schema_version = version
+        return True
+
+class ColumnarRepository:
+    """Compact backend: a memory-mapped uint8 score matrix plus a small metadata table
+
+    Files (sharing one prefix):
+      <prefix>.u8            row-major uint8 scores, one fixed-width row per response
+      <prefix>.columns.json  skill column names, i.e. the row layout
+      <prefix>.meta.csv      Response ID, Timestamp, Submitter Email, Submitter Name and Row
+    """
+
+    NA = 255  # Sentinel for "no value", e.g. a skill added after the response was submitted
+
+    def __init__(self, prefix, legacy_csv_path=None):
+        self.scores_path = f"{prefix}.u8"
+        self.columns_path = f"{prefix}.columns.json"
+        self.meta_path = f"{prefix}.meta.csv"
+        self.schema_path = f"{prefix}.schema.json"
+        self._schema_version = None
+        if not os.path.exists(self.columns_path):
+            # Import the legacy CSV once so existing history is not lost
+            if legacy_csv_path and os.path.exists(legacy_csv_path):
+                self._write_all(read_responses_csv(legacy_csv_path))
+            else:
+                self._write_all(pd.DataFrame(columns=METADATA_COLUMNS))
+
+    def _read_columns(self):
+        with open(self.columns_path) as f:
+            return json.load(f)
+
+    @classmethod
+    def _encode(cls, values):
+        """Convert scores to uint8, mapping missing values to the NA sentinel"""
+        values = np.asarray(values, dtype=float)
+        missing = np.isnan(values)
+        filled = np.where(missing, 0, values)
+        if ((filled < 0) | (filled >= cls.NA) | (filled != np.round(filled))).any():
+            raise ValueError("Columnar storage only holds whole points between 0 and 254")
+        encoded = filled.astype(np.uint8)
+        encoded[missing] = cls.NA
+        return encoded
+
+    def _write_all(self, df):
+        """Rewrite all three files from a response frame"""
+        skill_cols = [col for col in df.columns if col not in METADATA_COLUMNS]
+        scores = self._encode(df[skill_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+                              if skill_cols else np.zeros((len(df), 0)))
+        meta = df.reindex(columns=METADATA_COLUMNS).copy()
+        meta['Row'] = np.arange(len(df))
+        atomic_write(self.scores_path, lambda f: f.write(scores.tobytes()), mode='wb')
+        atomic_write(self.meta_path, lambda f: meta.to_csv(f, index=False))
+        # The layout is written last; it is what marks the store as initialized
+        atomic_write(self.columns_path, lambda f: json.dump(skill_cols, f))
+
+    def load(self):
+        columns = self._read_columns()
+        meta = read_responses_csv(self.meta_path, on_bad_lines='skip')
+        width = len(columns)
+        size = os.path.getsize(self.scores_path) if os.path.exists(self.scores_path) else 0
+        nrows = size // width if width else len(meta)
+        meta['Row'] = pd.to_numeric(meta['Row'], errors='coerce')
+        # Drop metadata rows whose scores never made it to disk, keep the last writer of a row
+        meta = meta[meta['Row'].notna() & (meta['Row'] < nrows)].drop_duplicates('Row', keep='last')
+        row_index = meta['Row'].astype(int).to_numpy()
+        meta = meta.drop(columns='Row').reset_index(drop=True)
+        if width == 0 or size == 0:
+            return meta if width == 0 else meta.reindex(columns=METADATA_COLUMNS + columns)
+        matrix = np.memmap(self.scores_path, dtype=np.uint8, mode='r', shape=(nrows, width))
+        rows = np.asarray(matrix[row_index])
+        del matrix
+        scores = pd.DataFrame(rows, columns=columns)
+        missing = rows == self.NA
+        for i in np.flatnonzero(missing.any(axis=0)):
+            # Columns with gaps become float32 so missing values keep NaN semantics
+            scores[columns[i]] = np.where(missing[:, i], np.nan, rows[:, i]).astype(np.float32)
+        return pd.concat([meta, scores], axis=1)
+
+    def add(self, response_data):
+        columns = self._read_columns()
+        if any(col not in METADATA_COLUMNS and col not in columns for col in response_data):
+            # New skill columns change the row layout, so rewrite with the wider matrix
+            df = self.load()
+            self._write_all(pd.concat([df, pd.DataFrame([response_data])], ignore_index=True))
+            return
+        width = len(columns)
+        row = self._encode([response_data.get(col, np.nan) for col in columns])
+        fd = os.open(self.scores_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # Drop any partial row left by a crash before appending a whole one
+            size = os.fstat(fd).st_size
+            row_number = size // width if width else 0
+            if width and size % width:
+                os.ftruncate(fd, row_number * width)
+            os.lseek(fd, 0, os.SEEK_END)
+            os.write(fd, row.tobytes())
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerow(
+            ['' if response_data.get(col) is None else response_data[col] for col in METADATA_COLUMNS]
+            + [row_number]
+        )
+        append_line(self.meta_path, buffer.getvalue().encode('utf-8'))
+
+    def find_by_email(self, email):
+        df = self.load()
+        return df[df['Submitter Email'] == email]
+
+    def delete(self, response_id):
+        df = self.load()
+        updated = df[df['Response ID'] != str(response_id)]
+        self._write_all(updated)
+        return len(updated) < len(df)
+
+    def clear(self):
+        self._write_all(pd.DataFrame(columns=METADATA_COLUMNS + self._read_columns()))
+
+    def version(self):
+        return _file_version(self.scores_path, self.meta_path, self.columns_path)
+
+    def migrate_schema(self, version, migrate):
+        """Rewrite the store with migrate() once if it predates the given schema version"""
+        if self._schema_version is None:
+            self._schema_version = _read_schema_version(self.schema_path)
+        if self._schema_version >= version:
+            return False
+        self._write_all(migrate(self.load()))
+        _write_schema_version(self.schema_path, version)
+        self._schema_version = version
+        return True
+
+_repositories = {}
+_repositories_lock = threading.Lock()
+
+def get_repository(backend, csv_path, log_path=None, db_path=None, columnar_prefix=None):
+    """Return the process-wide response repository for the configured storage backend"""
+    key = (backend, csv_path, log_path, db_path, columnar_prefix)
+    with _repositories_lock:
+        if key not in _repositories:
+            if backend == "csv":
+                _repositories[key] = CsvRepository(csv_path)
+            elif backend == "log":
+                _repositories[key] = LogRepository(csv_path, log_path)
+            elif backend == "sqlite":
+                _repositories[key] = SqliteRepository(db_path, legacy_csv_path=csv_path)
+            elif backend == "columnar":
+                _repositories[key] = ColumnarRepository(columnar_prefix, legacy_csv_path=csv_path)
+            else:
+                raise ValueError(f"Unknown storage backend: {backend}")
+        return _repositories[key]
+
+# Repositories whose schema this process has confirmed, so later checks skip the file lock
+_schema_checked = set()
+
+def migrate_schema_once(repository, version, migrate, lock):
+    """Run repository.migrate_schema under lock until it succeeds once in this process"""
+    key = (id(repository), version)
+    if key in _schema_checked:
+        return False
+    with lock:
+        migrated = repository.migrate_schema(version, migrate)
+    _schema_checked.add(key)
+    return migrated
+
+# Process-wide cache of parsed responses
+
+class ResponseCache:
+    """Bounded LRU of parsed response frames (or other values), each tagged with a data version"""
+
+    def __init__(self, max_entries=4, max_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, version, df, size=None):
+        if size is None:
+            size = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (version, df, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+response_cache = ResponseCache()
+
+def load_cached(repository):
+    """Load responses, reusing the cached frame while the repository's data version is unchanged
+
+    The returned frame is shared by every session in the process and must not be modified in place.
+    """
+    key = id(repository)
+    # Read the version before loading so a concurrent write only ever causes an extra reload
+    version = repository.version()
+    df = response_cache.get(key, version)
+    if df is None:
+        df = repository.load()
+        response_cache.put(key, version, df)
+    return df
+
+# Chunked export
+#
+# Exports are encoded a chunk of rows at a time straight into the output buffer, so
+# building one never holds an intermediate copy of the whole file as text.
+
+EXPORT_FORMATS = {
+    'csv': ("skills_responses.csv", "text/csv"),
+    'csv.gz': ("skills_responses.csv.gz", "application/gzip"),
+    'parquet': ("skills_responses.parquet", "application/vnd.apache.parquet"),
+}
+
+def export_formats():
+    """Export formats available in this environment"""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != 'parquet' or pq is not None]
+
+def export_responses(df, fmt='csv', chunk_rows=5000):
+    """Encode df in the given format, chunk_rows rows at a time, and return the file contents as bytes"""
+    if fmt not in export_formats():
+        raise ValueError(f"Unsupported export format: {fmt}")
+    out = io.BytesIO()
+    if fmt == 'parquet':
+        schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+        # Empty object columns infer as null; they hold the text metadata
+        for i, field in enumerate(schema):
+            if pa.types.is_null(field.type):
+                schema = schema.set(i, field.with_type(pa.string()))
+        with pq.ParquetWriter(out, schema) as writer:
+            for start in range(0, len(df), chunk_rows):
+                chunk = df.iloc[start:start + chunk_rows]
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    else:
+        raw = gzip.GzipFile(fileobj=out, mode='wb') if fmt == 'csv.gz' else out
+        text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        df.iloc[:0].to_csv(text, index=False)
+        for start in range(0, len(df), chunk_rows):
+            df.iloc[start:start + chunk_rows].to_csv(text, index=False, header=False)
+        text.flush()
+        # Detach so closing the wrappers does not close the buffer
+        text.detach()
+        if raw is not out:
+            raw.close()
+    return out.getvalue()
@@ -0,0 +1,218 @@
+import io
+import os
+import sys
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalogue import METADATA_COLUMNS, SKILL_COLUMNS, migrate_frame
+from storage import (CsvRepository, FileLock, append_json_line, export_responses, get_repository,
+                     migrate_schema_once, read_last_json_lines, read_responses_csv, to_sparse, to_wide)
+
+BACKENDS = ["csv", "log", "sqlite", "columnar"]
+
+# Response IDs that pandas would otherwise infer as numbers
+NUMERIC_LOOKING_IDS = ["12345678", "12e45678", "00001234"]
+
+def make_response(response_id, points=10):
+    return {
+        'Response ID': response_id,
+        'Timestamp': "2024-01-01 09:00:00",
+        'Submitter Email': f"{response_id}@example.com",
+        'Submitter Name': "1234",
+        'Acquisitions (Skill 1)': points,
+    }
+
+def open_repository(backend, tmp_path):
+    """Open a backend whose files live in tmp_path, importing responses.csv if it exists"""
+    return get_repository(backend, str(tmp_path / "responses.csv"), log_path=str(tmp_path / "responses.log"),
+                          db_path=str(tmp_path / "responses.db"),
+                          columnar_prefix=str(tmp_path / "responses"))
+
+@pytest.fixture(params=BACKENDS)
+def repository(request, tmp_path):
+    return open_repository(request.param, tmp_path)
+
+def test_add_find_and_delete(repository):
+    repository.add(make_response("r1", points=10))
+    repository.add(make_response("r2", points=7))
+    repository.add(dict(make_response("r3", points=3), **{'Submitter Email': "r1@example.com"}))
+
+    df = repository.load()
+    assert list(df['Response ID']) == ["r1", "r2", "r3"]
+    assert df['Acquisitions (Skill 1)'].tolist() == [10, 7, 3]
+    found = repository.find_by_email("r1@example.com")
+    assert list(found['Response ID']) == ["r1", "r3"]
+    assert repository.find_by_email("nobody@example.com").empty
+
+    assert repository.delete("r1")
+    assert not repository.delete("missing")
+    assert list(repository.load()['Response ID']) == ["r2", "r3"]
+    assert list(repository.find_by_email("r1@example.com")['Response ID']) == ["r3"]
+
+def test_every_write_bumps_the_version(repository):
+    versions = [repository.version()]
+    repository.add(make_response("r1"))
+    versions.append(repository.version())
+    repository.add(make_response("r2"))
+    versions.append(repository.version())
+    repository.delete("r1")
+    versions.append(repository.version())
+    repository.clear()
+    versions.append(repository.version())
+
+    assert len(set(versions)) == len(versions)
+    assert repository.version() == versions[-1]
+    assert repository.load().empty
+
+def test_numeric_looking_ids_round_trip(repository):
+    repository.add(make_response("abcdef01"))
+    # First load parses the whole file; the following adds go through the incremental path
+    assert list(repository.load()['Response ID']) == ["abcdef01"]
+    for response_id in NUMERIC_LOOKING_IDS:
+        repository.add(make_response(response_id))
+
+    df = repository.load()
+    assert list(df['Response ID']) == ["abcdef01"] + NUMERIC_LOOKING_IDS
+    assert list(df['Submitter Name']) == ["1234"] * 4
+    assert df['Acquisitions (Skill 1)'].tolist() == [10] * 4
+
+def test_delete_numeric_looking_id_keeps_other_ids(repository, tmp_path):
+    repository.add(make_response("abcdef01"))
+    repository.load()
+    for response_id in NUMERIC_LOOKING_IDS:
+        repository.add(make_response(response_id))
+
+    assert repository.delete("12345678")
+    assert list(repository.load()['Response ID']) == ["abcdef01", "12e45678", "00001234"]
+    if isinstance(repository, CsvRepository):
+        # The rewritten file must keep the ids exactly as submitted
+        csv_path = str(tmp_path / "responses.csv")
+        assert list(read_responses_csv(csv_path)['Response ID']) == ["abcdef01", "12e45678", "00001234"]
+        with open(csv_path) as f:
+            content = f.read()
+        assert "12345678.0" not in content and "inf" not in content
+
+def test_append_after_a_torn_row_keeps_the_new_row(tmp_path):
+    csv_path = str(tmp_path / "responses.csv")
+    repository = CsvRepository(csv_path)
+    repository.add(make_response("r1"))
+    repository.load()
+    # A crash mid-append leaves a row without its newline
+    with open(csv_path, 'a') as f:
+        f.write("torn,2024-01-01")
+    repository.add(make_response("r2", points=7))
+
+    df = repository.load().set_index('Response ID')
+    assert df.loc["r1", 'Acquisitions (Skill 1)'] == 10
+    assert df.loc["r2", 'Acquisitions (Skill 1)'] == 7
+    assert df.loc["r2", 'Submitter Email'] == "r2@example.com"
+
+def test_migrate_schema_once_skips_the_lock_after_the_first_check(repository, tmp_path):
+    entered = []
+
+    class CountingLock(FileLock):
+        def __enter__(self):
+            entered.append(1)
+            return super().__enter__()
+
+    lock = CountingLock(str(tmp_path / "responses.lock"))
+    repository.add(make_response("abcdef01"))
+
+    assert migrate_schema_once(repository, 2, lambda df: df, lock)
+    assert not migrate_schema_once(repository, 2, lambda df: df, lock)
+    assert len(entered) == 1
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_migration_folds_historical_columns_on_every_backend(backend, tmp_path):
+    # Early responses were stored under misspelt or renumbered skill columns
+    legacy = pd.DataFrame({
+        'Response ID': ["r1", "r2", "r3"],
+        'Timestamp': "2024-01-01 09:00:00",
+        'Submitter Email': ["a@example.com", "b@example.com", "c@example.com"],
+        'Submitter Name': ["A", "B", "C"],
+        'Acquisitions (Skill 1)': [10, np.nan, np.nan],
+        'Aquisitions (Skill 6)': [np.nan, 8, np.nan],
+        'Advertising Technology (AdTech) (Skill 3)': [np.nan, np.nan, 5],
+    })
+    legacy.to_csv(tmp_path / "responses.csv", index=False)
+    expected = migrate_frame(legacy)[SKILL_COLUMNS].sum()
+
+    repository = open_repository(backend, tmp_path)
+    assert repository.migrate_schema(2, migrate_frame)
+
+    df = repository.load()
+    assert list(df.columns[:len(METADATA_COLUMNS)]) == METADATA_COLUMNS
+    sums = df.reindex(columns=SKILL_COLUMNS).astype(float).sum()
+    assert sums['Acquisitions (Skill 1)'] == 18
+    assert sums['Advertising Technology (AdTech) (Skill 4)'] == 5
+    pd.testing.assert_series_equal(sums, expected.astype(float))
+
+def test_sparse_round_trip():
+    wide = pd.DataFrame({
+        'Response ID': ["r1", "r2"],
+        'Timestamp': "2024-01-01 09:00:00",
+        'Submitter Email': ["a@example.com", "b@example.com"],
+        'Submitter Name': ["A", "B"],
+        'Acquisitions (Skill 1)': [10.0, 0.0],
+        'Amalgamations (Skill 6)': [0.0, 7.0],
+    })
+    meta, allocations, skill_cols = to_sparse(wide)
+    # Only allocated points are kept
+    assert allocations.values.tolist() == [["r1", 'Acquisitions (Skill 1)', 10.0],
+                                           ["r2", 'Amalgamations (Skill 6)', 7.0]]
+
+    pd.testing.assert_frame_equal(to_wide(meta, allocations, skill_cols), wide)
+    # Unallocated cells can be told apart from explicit values when asked for
+    unfilled = to_wide(meta, allocations, skill_cols, fill_value=np.nan)
+    assert unfilled[skill_cols].isna().values.tolist() == [[False, True], [True, False]]
+
+def test_json_log_compacts_to_the_newest_entries(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    for i in range(200):
+        append_json_line(path, {'id': i, 'padding': "x" * 80}, keep=10, compact_bytes=4096)
+
+    # Compaction keeps the file bounded and never drops the newest entries
+    assert os.path.getsize(path) <= 4096 + 100
+    ids = [entry['id'] for entry in read_last_json_lines(path, 1000)]
+    assert ids[-1] == 199
+    assert ids == list(range(ids[0], 200))
+    assert 10 <= len(ids) < 50
+
+def test_read_last_json_lines_scans_back_across_blocks(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    with open(path, 'w') as f:
+        for i in range(50):
+            f.write(json.dumps({'id': i}) + "\n")
+        # A line torn by a crash is terminated and skipped
+        f.write('{"id": "torn')
+    append_json_line(path, {'id': 50})
+
+    assert [e['id'] for e in read_last_json_lines(path, 5, block_size=16)] == [46, 47, 48, 49, 50]
+    assert [e['id'] for e in read_last_json_lines(path, 1000)] == list(range(51))
+    assert read_last_json_lines(path, 0) == []
+    assert read_last_json_lines(str(tmp_path / "missing.jsonl"), 5) == []
+
+@pytest.mark.parametrize("fmt", ["csv", "csv.gz", "parquet"])
+def test_export_round_trip(fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    df = pd.DataFrame([make_response(response_id, points=i)
+                       for i, response_id in enumerate(["abcdef01"] + NUMERIC_LOOKING_IDS)])
+    # Several chunks, with the last one short
+    data = export_responses(df, fmt, chunk_rows=2)
+
+    assert isinstance(data, bytes)
+    if fmt == "parquet":
+        exported = pd.read_parquet(io.BytesIO(data))
+    else:
+        exported = read_responses_csv(io.BytesIO(data), compression='gzip' if fmt == "csv.gz" else None)
+    pd.testing.assert_frame_equal(exported, df, check_dtype=False)
+
+def test_export_rejects_unknown_formats():
+    with pytest.raises(ValueError):
+        export_responses(pd.DataFrame(), "xlsx")